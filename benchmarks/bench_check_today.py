@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark the daily skip check against a local fake GitHub API
+Shows that check_today_commits costs a constant number of requests as history grows.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from fake_github import FakeGitHub
+
+HISTORY_SIZES = [100, 1000, 10000]
+
+
+def legacy_check_today_commits(repo):
+    """The pre-optimisation check: paginate everything, then query since midnight"""
+    today = datetime.now().date()
+    if not list(repo.get_commits()):
+        return False
+    commits = list(repo.get_commits(since=datetime.combine(today, datetime.min.time())))
+    return any(c.commit.author.date.date() == today for c in commits)
+
+
+def measure(fake, func):
+    fake.reset_counts()
+    start = time.perf_counter()
+    result = func()
+    return result, fake.request_count, time.perf_counter() - start
+
+
+def main():
+    with FakeGitHub() as fake:
+        Config.GITHUB_TOKEN = Config.GITHUB_TOKEN or "bench-token"
+        Config.GITHUB_API_URL = fake.url
+        Config.REPO_OWNER = fake.owner
+        Config.GITHUB_REPO = fake.repo
+        Config.GITHUB_BRANCH = fake.branch
+        Config.LEDGER_PATH = ":memory:"
+        Config.HTTP_CACHE_PATH = ":memory:"
+
+        from commit_bot import GitHubCommitBot
+        bot = GitHubCommitBot()
+
+        print(f"{'history':>8} | {'legacy reqs':>11} {'legacy s':>9} | {'head reqs':>9} {'head s':>8} | {'ledger reqs':>11}")
+        print("-" * 70)
+        for size in HISTORY_SIZES:
+            fake.commits = []
+            fake.add_history(size)
+
+            legacy, legacy_reqs, legacy_time = measure(fake, lambda: legacy_check_today_commits(bot.repo))
+
+            Config.LEDGER_TTL = 0
+            current, head_reqs, head_time = measure(fake, bot.check_today_commits)
+            assert legacy == current, "legacy and head checks disagree"
+
+            Config.LEDGER_TTL = 3600
+            cached, ledger_reqs, _ = measure(fake, bot.check_today_commits)
+            assert cached == current, "ledger and head checks disagree"
+
+            print(f"{size:>8} | {legacy_reqs:>11} {legacy_time:>9.3f} | {head_reqs:>9} {head_time:>8.4f} | {ledger_reqs:>11}")
+
+
+if __name__ == "__main__":
+    main()
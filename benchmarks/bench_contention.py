@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Measure compare-and-swap pushes with several writers on one branch
+Each writer commits into its own clone of a shared bare origin and pushes
+after every commit; rejected pushes are rebased onto the new tip and retried.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_git_backends import make_clone
+from git_backend import BACKENDS
+
+
+def add_writer(root, origin, index):
+    work = os.path.join(root, f"writer-{index}")
+    subprocess.run(["git", "clone", "-q", origin, work], check=True, capture_output=True)
+    for key, value in (("user.name", f"Writer {index}"), ("user.email", f"writer{index}@example.com")):
+        subprocess.run(["git", "config", key, value], cwd=work, check=True)
+    return work
+
+
+def run_writer(backend, index, commits, failures):
+    for i in range(commits):
+        path = f"contributions/writer{index}_{i:06d}.md"
+        backend.commit_file(path, f"# Writer {index} contribution {i}\n", f"Writer {index} commit {i}", "main")
+        if not backend.push("main"):
+            failures.append((index, i))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4, help="concurrent writers")
+    parser.add_argument("--commits", type=int, default=25, help="commits (and pushes) per writer")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="object")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_clone(root, "seed")
+        origin = os.path.join(root, "seed-origin.git")
+        backends = [BACKENDS[args.backend](add_writer(root, origin, i)) for i in range(args.writers)]
+        failures = []
+        threads = [threading.Thread(target=run_writer, args=(backend, i, args.commits, failures))
+                   for i, backend in enumerate(backends)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        landed = int(subprocess.run(["git", "rev-list", "--count", "main"], cwd=origin,
+                                    capture_output=True, text=True).stdout) - 1
+        print(f"{'writer':>8} | {'pushes':>6} {'contended':>9} {'retries':>7} {'failed':>6}")
+        print("-" * 45)
+        for i, backend in enumerate(backends):
+            stats = backend.push_stats.as_dict()
+            print(f"{i:>8} | {stats['pushes']:>6} {stats['contended']:>9} {stats['retries']:>7} {stats['failed']:>6}")
+        total = args.writers * args.commits
+        contended = sum(backend.push_stats.contended for backend in backends)
+        print(f"{landed}/{total} commits landed in {elapsed:.2f}s ({landed / elapsed:.1f} commits/s), "
+              f"contention rate {contended / total:.0%}, {len(failures)} pushes gave up")
+        if not failures and landed != total:
+            raise RuntimeError("origin does not hold every pushed commit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare commits/sec of the shell and in-process git backends
+Each backend commits into a fresh clone of a local bare repository.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from git_backend import BACKENDS
+
+
+def make_clone(root, name):
+    """Create a bare `origin` plus a clone with one seed commit on main"""
+    origin = os.path.join(root, f"{name}-origin.git")
+    work = os.path.join(root, name)
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", origin], check=True)
+    subprocess.run(["git", "clone", "-q", origin, work], check=True, capture_output=True)
+    for key, value in (("user.name", "Bench Bot"), ("user.email", "bench@example.com")):
+        subprocess.run(["git", "config", key, value], cwd=work, check=True)
+    subprocess.run(["git", "checkout", "-q", "-b", "main"], cwd=work, check=True)
+    with open(os.path.join(work, "README.md"), "w") as f:
+        f.write("# bench\n")
+    subprocess.run(["git", "add", "README.md"], cwd=work, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "seed"], cwd=work, check=True)
+    subprocess.run(["git", "push", "-q", "origin", "main"], cwd=work, check=True, capture_output=True)
+    return work
+
+
+def run_backend(name, root, commits, push):
+    work = make_clone(root, name)
+    backend = BACKENDS[name](work)
+    start = time.perf_counter()
+    for i in range(commits):
+        path = f"contributions/contribution_{i:06d}.md"
+        if not backend.commit_file(path, f"# Contribution {i}\n", f"Benchmark commit {i}", "main"):
+            raise RuntimeError(f"{name} backend failed at commit {i}")
+        if push and not backend.push("main"):
+            raise RuntimeError(f"{name} backend failed to push commit {i}")
+    backend.close()
+    elapsed = time.perf_counter() - start
+
+    fsck = subprocess.run(["git", "fsck", "--strict"], cwd=work, capture_output=True, text=True)
+    status = subprocess.run(["git", "status", "--porcelain"], cwd=work, capture_output=True, text=True)
+    if fsck.returncode != 0 or status.stdout.strip():
+        raise RuntimeError(f"{name} backend left the repository inconsistent")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--commits", type=int, default=200, help="commits per backend")
+    parser.add_argument("--push", action="store_true", help="push to the bare origin after every commit")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        print(f"{'backend':>10} | {'commits':>7} {'seconds':>8} {'commits/s':>10}")
+        print("-" * 42)
+        for name in BACKENDS:
+            elapsed = run_backend(name, root, args.commits, args.push)
+            print(f"{name:>10} | {args.commits:>7} {elapsed:>8.2f} {args.commits / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
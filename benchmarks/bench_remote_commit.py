@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Exercise --remote-only commits against a local fake GitHub API
+Reports API requests per commit and checks the fake branch after each scenario.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from fake_github import FakeGitHub
+
+COMMITS = 20
+
+
+def make_bot(fake):
+    Config.GITHUB_TOKEN = Config.GITHUB_TOKEN or "bench-token"
+    Config.GITHUB_API_URL = fake.url
+    Config.REPO_OWNER = fake.owner
+    Config.GITHUB_REPO = fake.repo
+    Config.GITHUB_BRANCH = fake.branch
+    Config.LEDGER_PATH = ":memory:"
+    Config.HTTP_CACHE_PATH = ":memory:"
+    Config.REMOTE_ONLY = True
+
+    from commit_bot import GitHubCommitBot
+    bot = GitHubCommitBot()
+    bot.repo  # connect up front so the counts below are per commit
+    return bot
+
+
+def commit_once(fake, bot):
+    fake.reset_counts()
+    if not bot.create_commit():
+        raise RuntimeError("remote commit failed")
+    return fake.request_count
+
+
+def main():
+    with FakeGitHub() as fake:
+        bot = make_bot(fake)
+
+        first = commit_once(fake, bot)
+        print(f"empty repository:   {first} requests")
+
+        cold = commit_once(fake, bot)
+        print(f"cold cache:         {cold} requests")
+
+        warm = [commit_once(fake, bot) for _ in range(COMMITS)]
+        print(f"warm cache:         {sum(warm) / len(warm):.1f} requests/commit over {COMMITS} commits")
+
+        fake.push_commit()
+        moved = commit_once(fake, bot)
+        print(f"branch moved:       {moved} requests")
+
+        for child, parent in zip(fake.commits, fake.commits[1:]):
+            if child["parents"] and child["parents"] != [parent["sha"]]:
+                raise RuntimeError(f"branch history is not linear at {child['sha']}")
+        created = sum(1 for c in fake.commits if c["message"] in Config.COMMIT_MESSAGES)
+        if created != COMMITS + 3:
+            raise RuntimeError(f"expected {COMMITS + 3} bot commits on the branch, found {created}")
+        print(f"✅ branch has {created} bot commits in a linear history")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Startup cost of the bot: import time and a bare CLI invocation
+Parses `python -X importtime` output and fails if the import budget is exceeded.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_MS = 100
+# Modules that must only be imported once a command actually talks to GitHub
+HEAVY_MODULES = ("github", "requests", "urllib3", "jwt", "asyncio")
+
+
+def _env():
+    # Measure what users see: with cached bytecode, without our test overrides
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_profile(module="commit_bot"):
+    """Return (cumulative ms for `module`, {module imported by it: cumulative ms})"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        if name.strip() == module:
+            return int(cumulative) / 1000, modules
+        if not name.startswith("  "):
+            # a top-level import of the interpreter itself (site etc.), not ours
+            modules = {}
+            continue
+        modules[name.strip()] = int(cumulative) / 1000
+    raise RuntimeError(f"{module} missing from -X importtime output")
+
+
+def measure_startup(runs=5):
+    """Median import and `--help` times plus the heavy modules pulled in at import"""
+    import_profile()  # warm the bytecode cache
+    profiles = [import_profile() for _ in range(runs)]
+    import_ms = statistics.median(total for total, _ in profiles)
+    heavy = sorted(m for m in profiles[-1][1] if m in HEAVY_MODULES)
+
+    help_samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "commit_bot.py", "--help"], cwd=ROOT, env=_env(),
+                       capture_output=True, check=True)
+        help_samples.append(time.perf_counter() - start)
+    return {
+        "import_ms": import_ms,
+        "help_ms": statistics.median(help_samples) * 1000,
+        "heavy_imports": len(heavy),
+    }, heavy, profiles[-1][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="maximum median import time of commit_bot")
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest imports")
+    args = parser.parse_args()
+
+    metrics, heavy, modules = measure_startup(args.runs)
+    print(f"import commit_bot:      {metrics['import_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"commit_bot.py --help:   {metrics['help_ms']:.1f} ms")
+    print(f"heavy modules imported: {', '.join(heavy) or 'none'}")
+    print("slowest imports:")
+    for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"   {ms:>7.1f} ms  {name}")
+
+    if metrics["import_ms"] > args.budget_ms or heavy:
+        print("❌ Startup budget exceeded")
+        return 1
+    print("✅ Startup within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Per-commit cost of each contributions layout as history grows
+Seeds a clone with N existing contributions, then times new commits.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_git_backends import make_clone
+from config import Config
+from git_backend import BACKENDS
+from storage import LAYOUTS, create_layout
+
+HISTORY_SIZES = [100, 1000, 10000]
+STEP = timedelta(hours=6)
+
+
+def seed_history(work, layout, size, start):
+    files = {}
+    for i in range(size):
+        when = start + STEP * i
+        path, content = layout.render(when, f"# Contribution {i}\n", lambda p: files.get(p))
+        files[path] = content
+    for path, content in files.items():
+        full_path = os.path.join(work, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+    subprocess.run(["git", "add", "-A"], cwd=work, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", f"seed {size}"], cwd=work, check=True)
+
+
+def time_commits(work, backend_name, layout, commits, start):
+    backend = BACKENDS[backend_name](work)
+    elapsed = 0.0
+    for i in range(commits):
+        when = start + timedelta(minutes=i)
+        read_existing = lambda path: backend.read_file(path, "main")
+        t0 = time.perf_counter()
+        path, content = layout.render(when, f"# New contribution {i}\n", read_existing)
+        backend.commit_file(path, content, f"Benchmark commit {i}", "main", when)
+        elapsed += time.perf_counter() - t0
+    t0 = time.perf_counter()
+    backend.close()
+    elapsed += time.perf_counter() - t0
+    return elapsed / commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=list(BACKENDS), default="object")
+    parser.add_argument("--commits", type=int, default=20, help="timed commits per run")
+    parser.add_argument("--sizes", type=int, nargs="+", default=HISTORY_SIZES)
+    args = parser.parse_args()
+
+    print(f"backend: {args.backend}")
+    print(f"{'layout':>8} | " + " ".join(f"{size:>10}" for size in args.sizes) + "   (ms/commit)")
+    print("-" * (12 + 11 * len(args.sizes)))
+    with tempfile.TemporaryDirectory() as root:
+        for name in LAYOUTS:
+            layout = create_layout(name, Config.CONTRIBUTIONS_DIR)
+            row = []
+            for size in args.sizes:
+                work = make_clone(root, f"{name}-{size}")
+                start = datetime(2020, 1, 1)
+                seed_history(work, layout, size, start)
+                per_commit = time_commits(work, args.backend, layout, args.commits, start + STEP * size)
+                row.append(per_commit * 1000)
+            print(f"{name:>8} | " + " ".join(f"{ms:>10.2f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Overhead of the tracing hooks, disabled and enabled
+Times an empty phase() block and a @traced call against plain calls.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tracing
+
+
+def noop():
+    return None
+
+
+def per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    traced_noop = tracing.traced("bench")(noop)
+
+    def empty_phase():
+        with tracing.phase("bench"):
+            pass
+
+    with tempfile.TemporaryDirectory() as root:
+        print(f"{'hook':>14} | {'disabled':>10} | {'enabled':>10}   (ns/call)")
+        print("-" * 44)
+        baseline = per_call(noop, args.iterations)
+        rows = []
+        for label, func in (("phase()", empty_phase), ("@traced", traced_noop)):
+            tracing.tracer.enabled = False
+            disabled = per_call(func, args.iterations)
+            tracing.enable(jsonl_path=os.path.join(root, "trace.jsonl"), metrics_path="")
+            enabled = per_call(func, args.iterations // 10)
+            rows.append((label, disabled, enabled))
+        print(f"{'plain call':>14} | {baseline:>10.0f} | {'-':>10}")
+        for label, disabled, enabled in rows:
+            print(f"{label:>14} | {disabled:>10.0f} | {enabled:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
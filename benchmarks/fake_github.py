@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the GitHub REST API the bot uses
+Point PyGithub at FakeGitHub.url (Config.GITHUB_API_URL) to run without network.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _sha(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+class FakeGitHub:
+    """In-memory GitHub with a single repository and request accounting"""
+
+    def __init__(self, owner="bench", repo="bench", branch="main"):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        self.commits = []  # newest first
+        self.objects = {}  # git data API commits and trees by SHA
+        self.requests = []
+        self.not_modified = 0
+        self.rate_limit = 5000
+        self.rate_remaining = 5000
+        self.rate_reset = int(time.time()) + 3600
+        self.secondary_limited = 0  # the next N requests fail with a secondary rate limit
+        self.retry_after = 1
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self):
+        return len(self.requests)
+
+    def reset_counts(self):
+        with self._lock:
+            self.requests = []
+            self.not_modified = 0
+
+    def add_history(self, count, end=None, step=timedelta(hours=6)):
+        """Append `count` synthetic commits, the newest one dated `end`"""
+        end = end or datetime.utcnow()
+        history = []
+        for i in range(count):
+            date = end - step * i
+            sha = hashlib.sha1(f"{self.repo}-{len(self.commits) + i}".encode()).hexdigest()
+            history.append({"sha": sha, "date": date, "message": "Update daily progress", "tree": EMPTY_TREE, "parents": []})
+        self.commits = history + self.commits
+
+    def push_commit(self, message="Manual change"):
+        """Advance the branch as another writer would, keeping the head tree"""
+        parent = self.commits[0] if self.commits else None
+        tree = parent["tree"] if parent else EMPTY_TREE
+        commit = self._new_commit(message, tree, [parent["sha"]] if parent else [])
+        self.commits.insert(0, commit)
+        return commit["sha"]
+
+    def commit_json(self, commit):
+        base = f"{self.url}/repos/{self.owner}/{self.repo}"
+        person = {"name": "bot", "email": "bot@example.com", "date": _iso(commit["date"])}
+        return {
+            "sha": commit["sha"],
+            "url": f"{base}/commits/{commit['sha']}",
+            "commit": {"author": person, "committer": person, "message": commit["message"]},
+        }
+
+    def git_commit_json(self, commit):
+        base = f"{self.url}/repos/{self.owner}/{self.repo}/git"
+        person = {"name": "bot", "email": "bot@example.com", "date": _iso(commit["date"])}
+        return {
+            "sha": commit["sha"],
+            "url": f"{base}/commits/{commit['sha']}",
+            "message": commit["message"],
+            "author": person,
+            "committer": person,
+            "tree": {"sha": commit["tree"], "url": f"{base}/trees/{commit['tree']}"},
+            "parents": [{"sha": p, "url": f"{base}/commits/{p}"} for p in commit["parents"]],
+        }
+
+    def ref_json(self):
+        base = f"{self.url}/repos/{self.owner}/{self.repo}/git"
+        head = self.commits[0]["sha"]
+        return {
+            "ref": f"refs/heads/{self.branch}",
+            "url": f"{base}/refs/heads/{self.branch}",
+            "object": {"sha": head, "type": "commit", "url": f"{base}/commits/{head}"},
+        }
+
+    def tree_files(self, sha):
+        return dict(self.objects.get(sha, {}).get("files", {}))
+
+    def _find_commit(self, sha):
+        if sha in self.objects:
+            return self.objects[sha]
+        return next((c for c in self.commits if c["sha"] == sha), None)
+
+    def _new_commit(self, message, tree, parents, date=None):
+        commit = {
+            "sha": _sha("commit", message, tree, tuple(parents), len(self.objects)),
+            "date": date or datetime.utcnow(),
+            "message": message,
+            "tree": tree,
+            "parents": parents,
+        }
+        self.objects[commit["sha"]] = commit
+        return commit
+
+    def repo_json(self):
+        return {
+            "id": 1,
+            "name": self.repo,
+            "full_name": f"{self.owner}/{self.repo}",
+            "owner": {"login": self.owner},
+            "private": False,
+            "html_url": f"https://github.com/{self.owner}/{self.repo}",
+            "url": f"{self.url}/repos/{self.owner}/{self.repo}",
+            "default_branch": self.branch,
+        }
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                with fake._lock:
+                    fake.requests.append((self.command, self.path))
+                    if fake.secondary_limited:
+                        fake.secondary_limited -= 1
+                        status, headers = 403, {"Retry-After": str(fake.retry_after)}
+                        payload = {"message": "You have exceeded a secondary rate limit."}
+                    elif fake.rate_remaining <= 0:
+                        status, payload, headers = 403, {"message": "API rate limit exceeded"}, {}
+                    else:
+                        status, payload, headers = fake.handle(self.command, self.path, body)
+                payload = json.dumps(payload).encode()
+                if self.command == "GET" and status == 200:
+                    etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+                    headers = dict(headers, ETag=etag)
+                    if self.headers.get("If-None-Match") == etag:
+                        with fake._lock:
+                            fake.not_modified += 1
+                        status, payload = 304, b""
+                with fake._lock:
+                    # conditional requests answered with 304 do not count against the quota
+                    if status != 304 and fake.rate_remaining > 0:
+                        fake.rate_remaining -= 1
+                    headers = dict(headers, **{
+                        "X-RateLimit-Limit": str(fake.rate_limit),
+                        "X-RateLimit-Remaining": str(fake.rate_remaining),
+                        "X-RateLimit-Reset": str(fake.rate_reset),
+                    })
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_PUT = _dispatch
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle(self, method, path, body=None):
+        parsed = urlparse(path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        parts = [p for p in parsed.path.split("/") if p]
+        not_found = (404, {"message": "Not Found"}, {})
+
+        if parts == ["user"]:
+            return 200, {"login": self.owner}, {}
+        if len(parts) < 3 or parts[:3] != ["repos", self.owner, self.repo]:
+            return not_found
+        rest = parts[3:]
+
+        if not rest:
+            return 200, self.repo_json(), {}
+        if rest == ["commits"] and method == "GET":
+            return self._list_commits(parsed.path, query)
+        if rest[0] == "git":
+            return self._git_data(method, rest[1:], body)
+        if rest[0] == "contents" and method == "PUT":
+            return self._put_contents("/".join(rest[1:]), body)
+        if len(rest) == 2 and rest[0] == "branches":
+            if rest[1] != self.branch or not self.commits:
+                return 404, {"message": "Branch not found"}, {}
+            return 200, {"name": self.branch, "commit": self.commit_json(self.commits[0])}, {}
+        return not_found
+
+    def _list_commits(self, path, query):
+        if not self.commits:
+            return 409, {"message": "Git Repository is empty."}, {}
+        commits = self.commits
+        if "since" in query:
+            since = datetime.strptime(query["since"], "%Y-%m-%dT%H:%M:%SZ")
+            commits = [c for c in commits if c["date"] >= since]
+        page = int(query.get("page", 1))
+        per_page = int(query.get("per_page", 30))
+        chunk = commits[(page - 1) * per_page:page * per_page]
+        headers = {}
+        if page * per_page < len(commits):
+            links = []
+            for rel, target in (("next", page + 1), ("last", -(-len(commits) // per_page))):
+                params = dict(query, page=target, per_page=per_page)
+                link = "&".join(f"{k}={v}" for k, v in params.items())
+                links.append(f'<{self.url}{path}?{link}>; rel="{rel}"')
+            headers["Link"] = ", ".join(links)
+        return 200, [self.commit_json(c) for c in chunk], headers
+
+    def _git_data(self, method, rest, body):
+        if rest[:1] in (["ref"], ["refs"]) and rest[1:] == ["heads", self.branch]:
+            if not self.commits:
+                return 409, {"message": "Git Repository is empty."}, {}
+            if method == "PATCH":
+                new = self._find_commit(body["sha"])
+                if new is None:
+                    return 422, {"message": "Object does not exist"}, {}
+                chain = [new]
+                while chain[-1]["parents"] and chain[-1]["parents"][0] != self.commits[0]["sha"]:
+                    parent = self.objects.get(chain[-1]["parents"][0])
+                    if parent is None:
+                        return 422, {"message": "Update is not a fast forward"}, {}
+                    chain.append(parent)
+                if not chain[-1]["parents"]:
+                    return 422, {"message": "Update is not a fast forward"}, {}
+                self.commits[:0] = chain
+            return 200, self.ref_json(), {}
+        if rest[:1] == ["commits"] and method == "GET" and len(rest) == 2:
+            commit = self._find_commit(rest[1])
+            if commit is None:
+                return 404, {"message": "Not Found"}, {}
+            return 200, self.git_commit_json(commit), {}
+        if rest == ["trees"] and method == "POST":
+            files = self.tree_files(body.get("base_tree"))
+            for entry in body["tree"]:
+                files[entry["path"]] = entry.get("content", entry.get("sha"))
+            sha = _sha("tree", tuple(sorted(files.items())))
+            self.objects[sha] = {"files": files}
+            return 201, {"sha": sha, "url": f"{self.url}/repos/{self.owner}/{self.repo}/git/trees/{sha}", "tree": []}, {}
+        if rest == ["commits"] and method == "POST":
+            date = None
+            if body.get("author", {}).get("date"):
+                date = datetime.fromisoformat(body["author"]["date"].replace("Z", "+00:00"))
+                date = date.astimezone(timezone.utc).replace(tzinfo=None)
+            commit = self._new_commit(body["message"], body["tree"], body["parents"], date)
+            return 201, self.git_commit_json(commit), {}
+        return 404, {"message": "Not Found"}, {}
+
+    def _put_contents(self, path, body):
+        if body.get("branch", self.branch) != self.branch:
+            return 404, {"message": "Branch not found"}, {}
+        parent = self.commits[0] if self.commits else None
+        files = self.tree_files(parent["tree"]) if parent else {}
+        files[path] = base64.b64decode(body["content"]).decode()
+        tree = _sha("tree", tuple(sorted(files.items())))
+        self.objects[tree] = {"files": files}
+        commit = self._new_commit(body["message"], tree, [parent["sha"]] if parent else [])
+        self.commits.insert(0, commit)
+        return 201, {"content": {"path": path, "name": path.split("/")[-1]}, "commit": self.git_commit_json(commit)}, {}
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for GitHub Commit Bot
+Runs the bot against a local bare origin and the fake GitHub API with
+synthetic histories, and compares the results with a saved JSON baseline.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_git_backends import make_clone
+from bench_startup import measure_startup
+from config import Config
+from fake_github import FakeGitHub
+from git_backend import BACKENDS
+from storage import LAYOUTS, create_layout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+QUICK_SIZES = [100, 1000, 10000]
+FULL_SIZES = [100, 1000, 10000, 100000, 1000000]
+HISTORY_STEP = timedelta(minutes=10)
+
+# Differences below these floors are treated as noise when comparing
+NOISE_FLOOR = {"_ms": 1.0, "_kib": 256}
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def latency_stats(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return {"median_ms": statistics.median(samples) * 1000, "p95_ms": p95 * 1000}
+
+
+def peak_kib(func):
+    """Peak Python heap allocated while running `func` once"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def seed_local_history(root, name, layout, size):
+    """Bare origin plus clone whose main branch has `size` contribution commits"""
+    work = make_clone(root, name)
+    origin = os.path.join(root, f"{name}-origin.git")
+    start = datetime.now() - timedelta(days=1) - HISTORY_STEP * size
+    message = b"Update daily progress"
+    chunks = []
+    for i in range(size):
+        when = start + HISTORY_STEP * i
+        content = f"# Contribution {i}\n".encode()
+        chunks.append(
+            b"commit refs/heads/main\n"
+            + f"committer Bench Bot <bench@example.com> {int(when.timestamp())} +0000\n".encode()
+            + f"data {len(message)}\n".encode() + message + b"\n"
+            + (b"from refs/heads/main^0\n" if i == 0 else b"")
+            + f"M 100644 inline {layout.path_for(when)}\n".encode()
+            + f"data {len(content)}\n".encode() + content + b"\n"
+        )
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=origin, input=b"".join(chunks), check=True)
+    subprocess.run(["git", "pull", "-q", "--ff-only", "origin", "main"], cwd=work, check=True, capture_output=True)
+    return work
+
+
+def bench_local_commit(fake, root, backend, layout_name, size, commits):
+    from commit_bot import GitHubCommitBot
+
+    work = seed_local_history(root, f"{backend}-{size}", create_layout(layout_name, Config.CONTRIBUTIONS_DIR), size)
+    Config.GIT_BACKEND = backend
+    Config.REMOTE_ONLY = False
+    with quiet():
+        bot = GitHubCommitBot(repo_dir=work)
+
+        def commit():
+            if not bot.create_commit():
+                raise RuntimeError(f"{backend} commit failed at history {size}")
+
+        samples = timed(commit, commits)
+        memory = peak_kib(commit)
+    return dict(latency_stats(samples), peak_kib=memory)
+
+
+def bench_remote_commit(fake, size, commits):
+    from commit_bot import GitHubCommitBot
+
+    fake.commits, fake.objects = [], {}
+    fake.add_history(size, end=datetime.utcnow() - timedelta(days=1))
+    Config.REMOTE_ONLY = True
+    with quiet():
+        bot = GitHubCommitBot()
+        bot.repo  # the one-off repository lookup is not part of the per-operation cost
+        fake.reset_counts()
+        if not bot.create_commit():
+            raise RuntimeError("remote commit failed")
+        cold_requests = fake.request_count
+
+        fake.reset_counts()
+        samples = timed(bot.create_commit, commits)
+        warm_requests = fake.request_count / commits
+        memory = peak_kib(bot.create_commit)
+    Config.REMOTE_ONLY = False
+    return dict(latency_stats(samples), cold_requests=cold_requests, requests=warm_requests, peak_kib=memory)
+
+
+def bench_check_today(fake, size, repeat):
+    from commit_bot import GitHubCommitBot
+
+    fake.commits, fake.objects = [], {}
+    fake.add_history(size, end=datetime.utcnow() - timedelta(days=1))
+    with quiet():
+        bot = GitHubCommitBot()
+        bot.repo
+        Config.LEDGER_TTL = 0
+        fake.reset_counts()
+        samples = timed(bot.check_today_commits, repeat)
+        cold_requests = fake.request_count / repeat
+        memory = peak_kib(bot.check_today_commits)
+
+        Config.LEDGER_TTL = 3600
+        bot.check_today_commits()
+        fake.reset_counts()
+        bot.check_today_commits()
+        warm_requests = fake.request_count
+    return dict(latency_stats(samples), requests=cold_requests, ledger_requests=warm_requests, peak_kib=memory)
+
+
+def bench_history_stats(fake, size):
+    """Full history walk through the API, then an incremental rerun after one new commit"""
+    from commit_bot import GitHubCommitBot
+    from ledger import CommitLedger
+
+    fake.commits, fake.objects = [], {}
+    fake.add_history(size, end=datetime.utcnow() - timedelta(days=1))
+    with quiet():
+        bot = GitHubCommitBot(remote_only=True)
+        bot.repo
+        fake.reset_counts()
+        start = time.perf_counter()
+        bot.history_stats()
+        full_ms = (time.perf_counter() - start) * 1000
+        full_requests = fake.request_count
+
+        bot.create_commit()
+        fake.reset_counts()
+        start = time.perf_counter()
+        bot.history_stats()
+        incremental_ms = (time.perf_counter() - start) * 1000
+        incremental_requests = fake.request_count
+
+        bot.ledger = CommitLedger(":memory:", bot.ledger.repo)
+        memory = peak_kib(bot.history_stats)
+    return {"full_ms": full_ms, "full_requests": full_requests, "incremental_ms": incremental_ms,
+            "incremental_requests": incremental_requests, "peak_kib": memory}
+
+
+def _run_scheduler(jobs):
+    from scheduler import AsyncScheduler
+
+    # Shift the scheduler's clock so that noon is two seconds away
+    target = datetime.now().replace(microsecond=0) + timedelta(seconds=2)
+    offset = target.replace(hour=12, minute=0, second=0) - target
+    scheduler = AsyncScheduler(Config.SCHEDULER_CONCURRENCY, clock=lambda: datetime.now() + offset)
+    remaining = [jobs]
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                scheduler.stop()
+
+    for i in range(jobs):
+        scheduler.every_day_at("12:00:00", job, name=f"job{i}")
+    scheduler.run_forever()
+    return sorted(job.last_lag for job in scheduler.jobs)
+
+
+def bench_scheduler_lag(jobs):
+    """Lag between the due time and the start of `jobs` no-op jobs all due at once"""
+    lags = _run_scheduler(jobs)
+    return {
+        "median_lag_ms": statistics.median(lags) * 1000,
+        "max_lag_ms": lags[-1] * 1000,
+        "peak_kib": peak_kib(lambda: _run_scheduler(jobs)),
+    }
+
+
+def run_suite(args):
+    results = {"startup": report("startup", measure_startup()[0])}
+    with FakeGitHub() as fake, tempfile.TemporaryDirectory() as root:
+        Config.GITHUB_TOKEN = Config.GITHUB_TOKEN or "bench-token"
+        Config.GITHUB_API_URL = fake.url
+        Config.REPO_OWNER = fake.owner
+        Config.GITHUB_REPO = fake.repo
+        Config.GITHUB_BRANCH = fake.branch
+        Config.LEDGER_PATH = ":memory:"
+        Config.HTTP_CACHE_PATH = ":memory:"
+        Config.CONTRIBUTIONS_LAYOUT = args.layout
+
+        for size in args.sizes:
+            for backend in args.backends:
+                key = f"local_commit/{backend}/{args.layout}/{size}"
+                results[key] = report(key, bench_local_commit(fake, root, backend, args.layout, size, args.commits))
+            key = f"remote_commit/{size}"
+            results[key] = report(key, bench_remote_commit(fake, size, args.commits))
+            key = f"check_today/{size}"
+            results[key] = report(key, bench_check_today(fake, size, args.commits))
+            key = f"history_stats/{size}"
+            results[key] = report(key, bench_history_stats(fake, size))
+            key = f"scheduler_lag/{min(size, args.max_jobs)}"
+            if key not in results:
+                results[key] = report(key, bench_scheduler_lag(min(size, args.max_jobs)))
+    return results
+
+
+def report(key, metrics):
+    values = ", ".join(f"{name}={value:.2f}" if isinstance(value, float) else f"{name}={value}"
+                       for name, value in metrics.items())
+    print(f"📏 {key}: {values}")
+    return metrics
+
+
+def compare(baseline, results, tolerance):
+    """Return (key, metric, old, new) for every metric that got worse beyond tolerance"""
+    regressions = []
+    for key, metrics in results.items():
+        old_metrics = baseline.get("results", {}).get(key)
+        if not old_metrics:
+            continue
+        for name, new in metrics.items():
+            old = old_metrics.get(name)
+            if old is None:
+                continue
+            if "requests" in name or "imports" in name:
+                worse = new > old
+            else:
+                floor = next((v for suffix, v in NOISE_FLOOR.items() if name.endswith(suffix)), 0)
+                worse = new > old * (1 + tolerance) and new - old > floor
+            if worse:
+                regressions.append((key, name, old, new))
+    return regressions
+
+
+def metadata(args):
+    git_version = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git": git_version,
+        "sizes": args.sizes,
+        "commits": args.commits,
+        "layout": args.layout,
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=QUICK_SIZES, help="history sizes")
+    parser.add_argument("--full", action="store_true", help="use history sizes from 10^2 to 10^6")
+    parser.add_argument("--commits", type=int, default=20, help="timed operations per scenario")
+    parser.add_argument("--backends", nargs="+", default=["object", "shell"], choices=list(BACKENDS))
+    parser.add_argument("--layout", choices=list(LAYOUTS), default="sharded",
+                        help="layout of the synthetic local history (flat rewrites one huge tree per commit)")
+    parser.add_argument("--max-jobs", type=int, default=1000, help="cap on simultaneous scheduler jobs")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed relative slowdown before a timing counts as a regression")
+    args = parser.parse_args()
+    if args.full:
+        args.sizes = FULL_SIZES
+
+    results = run_suite(args)
+    document = {"meta": metadata(args), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("💡 No baseline yet, run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, results, args.tolerance)
+    if not regressions:
+        print(f"✅ No regressions against {os.path.relpath(args.baseline)}")
+        return 0
+    print(f"❌ {len(regressions)} regression(s) against {os.path.relpath(args.baseline)}:")
+    for key, name, old, new in regressions:
+        print(f"   {key} {name}: {old:.2f} -> {new:.2f}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
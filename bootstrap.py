@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Fast provisioning for GitHub Commit Bot
+Attaches a directory to an existing GitHub repository with a shallow,
+blobless fetch and a sparse checkout that leaves out the contributions
+directory. Setting up a runner no longer downloads and checks out every
+contribution ever written: the few files the bot appends to are fetched on
+demand, and a push that needs older history deepens the clone itself.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from config import Config
+from git_backend import _run_git
+
+
+def remote_url(owner=None, repo=None):
+    return f"https://github.com/{owner or Config.REPO_OWNER}/{repo or Config.GITHUB_REPO}.git"
+
+
+def _git(args, cwd, description):
+    result = _run_git(args, cwd)
+    if result.returncode != 0:
+        print(f"❌ {description} failed: {result.stderr.strip()}")
+        return False
+    return True
+
+
+def _disk_usage(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def bootstrap_repository(url, dest=".", branch=None, depth=None, sparse=True):
+    """Attach `dest` to `url` with a shallow, blobless, sparse checkout of `branch`
+
+    `dest` may be empty, missing, or hold the bot's own files (they are kept
+    as they are). Top-level directories other than CONTRIBUTIONS_DIR stay in
+    the checkout. Returns True on success.
+    """
+    branch = branch or Config.GITHUB_BRANCH
+    depth = depth or Config.BOOTSTRAP_DEPTH
+    start = time.perf_counter()
+    os.makedirs(dest, exist_ok=True)
+    if os.path.exists(os.path.join(dest, ".git")):
+        print(f"✅ {dest} is already a git repository, leaving it as it is")
+        return True
+
+    print(f"🔄 Fetching the last {depth} commit(s) of {branch} without file contents...")
+    steps = [
+        (["init", "-q"], "Initializing git repository"),
+        (["remote", "add", "origin", url], "Adding remote"),
+        # Blobs missing from a partial clone are fetched from the promisor remote when read
+        (["config", "remote.origin.promisor", "true"], "Configuring partial clone"),
+        (["config", "remote.origin.partialclonefilter", "blob:none"], "Configuring partial clone"),
+        (["fetch", "-q", f"--depth={depth}", "--filter=blob:none", "origin",
+          f"+refs/heads/{branch}:refs/remotes/origin/{branch}"], "Fetching history"),
+        (["symbolic-ref", "HEAD", f"refs/heads/{branch}"], "Setting branch"),
+    ]
+    for args, description in steps:
+        if not _git(args, dest, description):
+            return False
+
+    if sparse:
+        tip = f"refs/remotes/origin/{branch}"
+        dirs = _run_git(["ls-tree", "-d", "--name-only", tip], dest).stdout.split()
+        keep = [d for d in dirs if d != Config.CONTRIBUTIONS_DIR.strip("/").split("/")[0]]
+        # Cone mode always keeps the top-level files (README, CHANGELOG)
+        if not _git(["sparse-checkout", "set", "--cone"] + keep, dest, "Setting up sparse checkout"):
+            return False
+
+    # A mixed reset fills the index without touching files already in `dest`; then check out what is missing
+    if not _git(["reset", "-q", f"origin/{branch}"], dest, "Populating index"):
+        return False
+    missing = [p for p in _run_git(["ls-files", "-d", "-z"], dest).stdout.split("\0") if p]
+    if missing and not _git(["checkout", "-q", "--"] + missing, dest, "Checking out files"):
+        return False
+    _git(["branch", "-q", f"--set-upstream-to=origin/{branch}"], dest, "Setting upstream")
+
+    tags = [line[:1] for line in _run_git(["ls-files", "-t"], dest).stdout.splitlines()]
+    count, present = len(tags), sum(1 for tag in tags if tag != "S")
+    print(f"✅ Bootstrapped {dest} in {time.perf_counter() - start:.1f}s: {present}/{count} files checked out, "
+          f".git uses {_disk_usage(os.path.join(dest, '.git')) / 1024:.0f} KiB")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dest", nargs="?", default=".", help="directory to attach (default: current)")
+    parser.add_argument("--url", help="repository URL (default: REPO_OWNER/GITHUB_REPO on GitHub)")
+    parser.add_argument("--branch", help="branch to check out (default: GITHUB_BRANCH)")
+    parser.add_argument("--depth", type=int, help="commits of history to fetch (default: BOOTSTRAP_DEPTH)")
+    parser.add_argument("--full-checkout", action="store_true", help="check out the contributions directory too")
+    args = parser.parse_args()
+    ok = bootstrap_repository(args.url or remote_url(), args.dest, args.branch, args.depth,
+                              sparse=not args.full_checkout)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Control client for the GitHub Commit Bot daemon
+Sends one command over the daemon's Unix socket and prints the reply.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+
+def send(command, path=None, timeout=None, **fields):
+    """Send `command` to the daemon and return its decoded reply"""
+    if path is None:
+        path = Config.DAEMON_SOCKET
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(dict(fields, command=command)).encode() + b"\n")
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    return json.loads(reply)
+
+
+def print_status(reply):
+    state = "⏸️  paused" if reply["paused"] else "▶️  running"
+    print(f"👹 Daemon pid {reply['pid']}, up {reply['uptime_seconds']}s, {state}")
+    print(f"⏭️  Next cycle at {reply['next_fire_time']}")
+    print(f"📦 {len(reply['repos'])} repositories, {len(reply['warm_bots'])} warm")
+    for repo, result in sorted(reply["last_results"].items()):
+        mark = "✅" if result["ok"] else "❌"
+        print(f"   {mark} {repo} at {result['at']} ({result['seconds']:.2f}s) {result['error'] or ''}")
+    queued = {repo: depth for repo, depth in reply.get("outbox", {}).items() if depth}
+    for repo, depth in sorted(queued.items()):
+        print(f"   📮 {repo}: {depth} commits waiting to be pushed")
+    for repo, stats in sorted(reply.get("contention", {}).items()):
+        if stats["contended"]:
+            print(f"   🔀 {repo}: {stats['contended']}/{stats['pushes']} pushes contended "
+                  f"({stats['contention_rate']:.0%}), {stats['retries']} retries, {stats['failed']} failed")
+    for repo, last in sorted(reply.get("housekeeping", {}).items()):
+        print(f"   🧹 {repo}: {', '.join(last['tasks']) or 'nothing'} at {last['at']} ({last['seconds']:.1f}s)")
+    headroom = reply["rate_limit"]["headroom"]
+    if headroom is not None:
+        print(f"🛡️  API headroom {headroom:.0%}")
+    cache = reply.get("http_cache")
+    if cache and cache["hit_rate"] is not None:
+        print(f"🗄️  HTTP cache hit rate {cache['hit_rate']:.0%} ({cache['hits']} hits, {cache['misses']} misses)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control a running commit_bot.py --daemon")
+    parser.add_argument("command", choices=["status", "commit-now", "pause", "resume", "reload", "stop"])
+    parser.add_argument("--repo", help="owner/name for commit-now (default: every repository)")
+    parser.add_argument("--socket", help="control socket path (default: DAEMON_SOCKET)")
+    parser.add_argument("--json", action="store_true", help="print the raw JSON reply")
+    args = parser.parse_args()
+
+    fields = {"repo": args.repo} if args.repo else {}
+    try:
+        reply = send(args.command, args.socket, **fields)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("❌ Daemon is not running (start it with: python commit_bot.py --daemon)")
+        return 1
+
+    if args.json:
+        print(json.dumps(reply, indent=2))
+    elif not reply["ok"]:
+        print(f"❌ {reply['error']}")
+    elif args.command == "status":
+        print_status(reply)
+    elif args.command == "commit-now":
+        for result in reply["results"]:
+            mark = "✅" if result["ok"] else "❌"
+            print(f"{mark} {result['repo']} in {result['seconds']:.2f}s {result['error'] or ''}")
+    else:
+        print(f"✅ {args.command}: {json.dumps({k: v for k, v in reply.items() if k != 'ok'})}")
+    return 0 if reply["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
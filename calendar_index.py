@@ -0,0 +1,98 @@
+"""
+Contribution calendar index for GitHub Commit Bot
+One bit per day, 366 bits per year, built from the history histogram cached in
+the ledger. Membership is O(1); streaks, gap listings and "days missed since"
+counts are O(days). The backfill planner turns the gaps into commit timestamps.
+"""
+
+from datetime import date, datetime, timedelta
+
+from scheduler import parse_time
+
+YEAR_BYTES = 46  # 366 bits
+
+
+class ContributionCalendar:
+    """Day-indexed bitmap of the days with at least one commit"""
+
+    def __init__(self):
+        self._years = {}  # year -> bytearray, bit n is day-of-year n + 1
+
+    @classmethod
+    def from_days(cls, days):
+        """Build from an iterable of dates or (date, commits) pairs"""
+        calendar = cls()
+        for day in days:
+            if isinstance(day, tuple):
+                day, commits = day
+                if not commits:
+                    continue
+            calendar.add(day)
+        return calendar
+
+    @staticmethod
+    def _position(day):
+        return day.timetuple().tm_yday - 1
+
+    def add(self, day):
+        bits = self._years.setdefault(day.year, bytearray(YEAR_BYTES))
+        position = self._position(day)
+        bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, day):
+        bits = self._years.get(day.year)
+        if bits is None:
+            return False
+        position = self._position(day)
+        return bool(bits[position >> 3] & (1 << (position & 7)))
+
+    def count(self, start, end):
+        """Number of active days in [start, end]"""
+        total = 0
+        for year in range(start.year, end.year + 1):
+            bits = self._years.get(year)
+            if bits is None:
+                continue
+            first = self._position(start) if year == start.year else 0
+            last = self._position(end) if year == end.year else 365
+            word = int.from_bytes(bits, "little") >> first
+            total += (word & ((1 << (last - first + 1)) - 1)).bit_count()
+        return total
+
+    def missed(self, start, end):
+        """Number of days without a commit in [start, end]"""
+        if end < start:
+            return 0
+        return (end - start).days + 1 - self.count(start, end)
+
+    def gaps(self, start, end):
+        """Yield the days without a commit in [start, end], oldest first"""
+        day = start
+        while day <= end:
+            if day not in self:
+                yield day
+            day += timedelta(days=1)
+
+    def streak_ending(self, day):
+        """Length of the run of active days ending on `day`"""
+        length = 0
+        while day in self:
+            length += 1
+            day -= timedelta(days=1)
+        return length
+
+    def current_streak(self, today=None):
+        """Streak ending today, or yesterday while today has no commit yet"""
+        today = today or date.today()
+        return self.streak_ending(today) or self.streak_ending(today - timedelta(days=1))
+
+
+def plan_backfill(calendar, start, end, commit_times):
+    """Return one commit timestamp per day without a commit in [start, end]
+
+    Each missing day gets a single commit at the earliest of `commit_times`,
+    which is the least that closes the gap.
+    """
+    hour, minute, second = min(parse_time(time_str) for time_str in commit_times)
+    return [datetime(day.year, day.month, day.day, hour, minute, second)
+            for day in calendar.gaps(start, end)]
@@ -1,154 +1,454 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import random
-import time
-from datetime import datetime, timedelta
-from github import Github
-from dotenv import load_dotenv
-import schedule
+from datetime import datetime, timedelta, timezone
 from config import Config
+from github_client import get_github
+from governor import request_priority
+from tracing import phase, traced, tracer
+import tracing
+from ledger import CommitLedger
+from outbox import PushOutbox
+from generators import create_generator
+from git_backend import RemoteGitBackend, ShellGitBackend, UnsupportedRepository, create_backend, is_shallow
+
+def to_local(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone().replace(tzinfo=None)
 
 class GitHubCommitBot:
-    def __init__(self):
+    def __init__(self, repo_owner=None, repo_name=None, branch=None, repo_dir=None,
+                 remote_only=None, github=None, git=None, clock=None):
         Config.validate()
         
         self.token = Config.GITHUB_TOKEN
         self.username = Config.GITHUB_USERNAME
-        self.repo_name = Config.GITHUB_REPO
-        self.repo_owner = Config.REPO_OWNER
-        
-        self.github = Github(self.token)
+        self.repo_name = repo_name or Config.GITHUB_REPO
+        self.repo_owner = repo_owner or Config.REPO_OWNER
+        self.branch = branch or Config.GITHUB_BRANCH
+        self.remote_only = Config.REMOTE_ONLY if remote_only is None else remote_only
+        # Every "now" the bot acts on comes from here, so simulator.py can replay days in seconds
+        self.clock = clock or datetime.now
         
-        try:
-            self.repo = self.github.get_repo(f"{self.repo_owner}/{self.repo_name}")
-            print(f"✅ Connected to repository: {self.repo.full_name}")
-        except Exception as e:
-            print(f"❌ Failed to connect to repository: {e}")
-            print(f"🔍 Repository: {self.repo_owner}/{self.repo_name}")
-            print("💡 Make sure the repository exists and your token has access")
-            raise
+        # PyGithub and the repository lookup are deferred until a step needs them
+        self._github = github
+        self._repo = None
         
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
-        os.chdir(self.script_dir)
+        self.repo_dir = os.path.abspath(repo_dir or self.script_dir)
+        
+        ledger_path = Config.LEDGER_PATH
+        if ledger_path != ":memory:":
+            ledger_path = os.path.join(self.script_dir, ledger_path)
+        self.content = create_generator(Config.CONTENT_GENERATOR, Config.CONTRIBUTIONS_LAYOUT,
+                                        Config.CONTRIBUTIONS_DIR, Config.CONTENT_TEMPLATE)
+        self.ledger = CommitLedger(ledger_path, f"{self.repo_owner}/{self.repo_name}", clock=self.timestamp)
+        if git is not None:
+            self.git = git
+        elif self.remote_only:
+            self.git = RemoteGitBackend(lambda: self.repo, self.ledger)
+        else:
+            self.git = create_backend(Config.GIT_BACKEND, self.repo_dir)
+        self.outbox = PushOutbox(self.ledger, self.branch, self.push_branch, clock=self.timestamp)
+        self.housekeeper = None
+        if not self.remote_only and git is None and Config.HOUSEKEEPING_ENABLED:
+            from housekeeping import Housekeeper
+            self.housekeeper = Housekeeper(self.repo_dir, f"{self.repo_owner}/{self.repo_name}")
+    
+    def timestamp(self):
+        return self.clock().timestamp()
+    
+    @property
+    def github(self):
+        if self._github is None:
+            self._github = get_github(self.token)
+        return self._github
+    
+    @property
+    def repo(self):
+        if self._repo is None:
+            try:
+                with phase("connect", repo=f"{self.repo_owner}/{self.repo_name}"):
+                    self._repo = self.github.get_repo(f"{self.repo_owner}/{self.repo_name}")
+                print(f"✅ Connected to repository: {self._repo.full_name}")
+            except Exception as e:
+                print(f"❌ Failed to connect to repository: {e}")
+                print(f"🔍 Repository: {self.repo_owner}/{self.repo_name}")
+                print("💡 Make sure the repository exists and your token has access")
+                raise
+        return self._repo
+    
+    def push_branch(self):
+        """Push the branch; commits rebased onto another writer's commits keep their ledger rows"""
+        pushed = self.git.push(self.branch)
+        if self.git.rewritten:
+            self.ledger.rewrite_commits(self.git.rewritten)
+        return pushed
     
     def get_random_commit_message(self):
         return random.choice(Config.COMMIT_MESSAGES)
     
+    @traced("render")
+    def render_contributions(self, items):
+        """Render (when, message) items in one pass and return [(filename, content)]"""
+        # `pending` holds files rendered for this batch but not committed yet
+        pending = {}
+        
+        def read_existing(path):
+            if path in pending:
+                return pending[path]
+            return self.git.read_file(path, self.branch)
+        
+        return self.content.render_batch(items, read_existing, pending)
+    
+    def render_contribution(self, when, message=None):
+        return self.render_contributions([(when, message)])[0]
+    
     def create_commit(self):
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            random_number = random.randint(1, 1000)
-            
-            content = f"""# Daily Update - {timestamp}
-
-This is an automated commit to maintain GitHub contribution streak.
-
-## Details:
-- Date: {timestamp}
-- Random number: {random_number}
-- Commit type: Daily maintenance
-
-## Changes:
-- Updated contribution data
-- Maintained coding streak
-- Added progress tracking
-
-Generated by GitHub Commit Bot
-"""
-            
-            filename = f"{Config.CONTRIBUTIONS_DIR}/contribution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            
-            os.makedirs(Config.CONTRIBUTIONS_DIR, exist_ok=True)
-            
-            with open(filename, 'w') as f:
-                f.write(content)
-            
-            os.system(f"git add {filename}")
-            
+            now = self.clock()
             commit_message = self.get_random_commit_message()
-            os.system(f'git commit -m "{commit_message}"')
+            filename, content = self.render_contribution(now, commit_message)
+            
+            with self.outbox.lock:
+                try:
+                    sha = self.git.commit_file(filename, content, commit_message, self.branch)
+                except UnsupportedRepository as e:
+                    print(f"⚠️  {self.git.name} git backend failed ({e}), retrying with shell backend")
+                    self.git = ShellGitBackend(self.repo_dir)
+                    sha = self.git.commit_file(filename, content, commit_message, self.branch)
             
-            push_result = os.system("git push origin main")
+            if not sha:
+                print("❌ Failed to create local commit")
+                return False
             
-            if push_result == 0:
+            # Recorded as queued first, so a failed push is retried instead of committing again
+            self.ledger.record(sha, now, self.branch, False, commit_message, filename)
+            if self.outbox.push():
+                self.ledger.reconcile(self.branch, self.git.rewritten.get(sha, sha), now)
                 print(f"✅ Successfully created commit: {commit_message}")
                 print(f"📁 File created: {filename}")
                 return True
             else:
-                print("❌ Failed to push to GitHub")
+                print("❌ Failed to push to GitHub, the commit is queued for retry")
                 return False
                 
         except Exception as e:
             print(f"❌ Error creating commit: {str(e)}")
             return False
     
-    def check_today_commits(self):
+    def create_commits(self, count, spread_over=None):
+        """Create `count` commits with distinct timestamps ending now, then push once
+
+        Progress is kept in the ledger, so re-running an interrupted batch of
+        the same size resumes it instead of starting over.
+        """
         try:
-            today = datetime.now().date()
+            batch = self.ledger.open_batch(self.branch, count)
+            if batch is None:
+                step = max((spread_over or timedelta(0)) / max(count - 1, 1), timedelta(seconds=1))
+                batch = self.ledger.start_batch(self.branch, count, self.clock() - step * (count - 1), step)
+            else:
+                print(f"🔁 Resuming unfinished batch #{batch[0]}")
+            batch_id, first_at, step = batch
             
-            try:
-                commits = list(self.repo.get_commits())
-                if not commits:
-                    print("📝 Repository is empty, will create first commit")
-                    return False
-            except Exception:
-                print("📝 Repository appears to be empty, will create first commit")
+            done = self.ledger.batch_items(batch_id)
+            indexes = [index for index in range(count) if index not in done]
+            planned = [(first_at + step * index, self.get_random_commit_message()) for index in indexes]
+            items = [(index, filename, content, message, when)
+                     for index, (when, message), (filename, content)
+                     in zip(indexes, planned, self.render_contributions(planned))]
+            
+            def on_commit(position, sha):
+                index, filename, _, message, when = items[position]
+                self.ledger.record(sha, when, self.branch, False, message, filename)
+                self.ledger.record_batch_item(batch_id, index, sha)
+            
+            print(f"📦 Creating {len(items)} of {count} batch commits ({len(done)} already done)")
+            with self.outbox.lock:
+                self.git.commit_files([item[1:] for item in items], self.branch, on_commit)
+            
+            if not self.outbox.push():
+                print("❌ Failed to push batch to GitHub, it is queued for retry")
                 return False
             
-            commits = list(self.repo.get_commits(since=datetime.combine(today, datetime.min.time())))
+            shas = self.ledger.batch_items(batch_id)
+            self.ledger.reconcile(self.branch, shas[count - 1], first_at + step * (count - 1))
+            self.ledger.finish_batch(batch_id)
+            print(f"✅ Pushed {count} commits in one push")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error creating batch: {str(e)}")
+            return False
+    
+    def get_head_commit(self):
+        """Return the branch head commit (one request), or None if the repo is empty"""
+        from github import GithubException
+        
+        try:
+            return self.repo.get_branch(self.branch).commit
+        except GithubException as e:
+            if e.status in (404, 409):
+                return None
+            raise
+    
+    @traced("check")
+    def check_today_commits(self):
+        try:
+            today = self.clock().date()
+            
+            if self.ledger.has_pushed_commit_on(today, self.branch):
+                return True
+            if self.ledger.has_commit_on(today, self.branch):
+                print(f"📮 Today's commit is waiting in the outbox ({self.outbox.depth()} queued)")
+                return True
+            
+            cached = self.ledger.remote_head(self.branch, Config.LEDGER_TTL)
+            if cached is not None:
+                _, committed_at = cached
+                return committed_at is not None and committed_at.date() == today
             
-            today_commits = [
-                commit for commit in commits 
-                if commit.commit.author.date.date() == today
-            ]
+            # Skip checks decide whether anything else runs, so they get the reserved budget
+            with request_priority("high"):
+                head = self.get_head_commit()
+            if head is None:
+                self.ledger.reconcile(self.branch, None, None)
+                print("📝 Repository is empty, will create first commit")
+                return False
             
-            return len(today_commits) > 0
+            committed_at = to_local(head.commit.author.date)
+            self.ledger.reconcile(self.branch, head.sha, committed_at)
+            return committed_at.date() == today
             
         except Exception as e:
             print(f"⚠️  Could not check today's commits: {str(e)}")
             return False
     
     def run_daily_commit(self):
-        print(f"🤖 Starting daily commit process at {datetime.now()}")
+        print(f"🤖 Starting daily commit process at {self.clock()}")
         
-        if self.check_today_commits():
-            print("✅ Already have commits today, skipping...")
-            return
-        
-        success = self.create_commit()
+        with tracer.context(repo=f"{self.repo_owner}/{self.repo_name}"):
+            # A scheduled run is a good moment to retry anything left over from earlier failures
+            self.outbox.drain(force=True)
+            if self.check_today_commits():
+                print("✅ Already have commits today, skipping...")
+                tracer.flush()
+                return True
+            
+            success = self.create_commit()
+        tracer.flush()
         
         if success:
             print("🎉 Daily commit completed successfully!")
         else:
             print("💥 Daily commit failed!")
+        return success
+    
+    def refresh_history(self):
+        """Fold the commits added since the last run into the ledger's per-day histogram"""
+        import history_stats
+        
+        # A shallow clone (see bootstrap.py) only knows its last few commits
+        if (not self.remote_only and history_stats.has_local_ref(self.repo_dir, self.branch)
+                and not is_shallow(self.repo_dir)):
+            walk = lambda since: history_stats.iter_local_history(self.repo_dir, self.branch, since)
+        else:
+            walk = lambda since: history_stats.iter_remote_history(self.repo, self.branch)
+        with request_priority("low"):
+            return history_stats.update_history(self.ledger, self.branch, walk)
+    
+    def history_stats(self):
+        """Bring the cached history histogram up to date and return (stats, commits processed)"""
+        from history_stats import summarize
+        
+        processed = self.refresh_history()
+        return summarize(self.ledger, self.branch), processed
+    
+    def contribution_calendar(self):
+        from calendar_index import ContributionCalendar
+        
+        self.refresh_history()
+        return ContributionCalendar.from_days(self.ledger.history_days(self.branch))
+    
+    def backfill(self, period, dry_run=False):
+        """Commit once on every day of the last `period` without a commit, then push once
+
+        Today is left to the daily job. Commits from an interrupted run are
+        already in the history, so a re-run only pushes them.
+        """
+        from calendar_index import plan_backfill
+        from schedule_planner import commit_times_for
+        
+        try:
+            calendar = self.contribution_calendar()
+            today = self.clock().date()
+            start = (self.clock() - period).date()
+            end = today - timedelta(days=1)
+            plan = plan_backfill(calendar, start, end, commit_times_for(f"{self.repo_owner}/{self.repo_name}"))
+            print(f"🗓️  {len(plan)} of {max((end - start).days + 1, 0)} days since {start} have no commit "
+                  f"(current streak: {calendar.current_streak(today)} days)")
+            for when in plan:
+                print(f"   - {when:%Y-%m-%d %H:%M}")
+            if dry_run:
+                return True
+            if not plan and not self.ledger.unpushed(self.branch):
+                print("✅ Nothing to backfill")
+                return True
+            
+            planned = [(when, self.get_random_commit_message()) for when in plan]
+            items = [(filename, content, message, when)
+                     for (when, message), (filename, content) in zip(planned, self.render_contributions(planned))]
+            
+            def on_commit(position, sha):
+                filename, _, message, when = items[position]
+                self.ledger.record(sha, when, self.branch, False, message, filename)
+            
+            with self.outbox.lock:
+                self.git.commit_files(items, self.branch, on_commit)
+            if not self.outbox.push():
+                print("❌ Failed to push backfill to GitHub, it is queued for retry")
+                return False
+            print(f"✅ Backfilled {len(plan)} days in one push")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error backfilling: {str(e)}")
+            return False
+    
+    def start_housekeeping(self, commit_times):
+        """Keep the clone packed in the idle windows between `commit_times`"""
+        if self.housekeeper:
+            self.housekeeper.start(commit_times)
+    
+    def run_maintenance(self):
+        if not self.housekeeper:
+            print("⏭️  No local clone to maintain (remote-only or HOUSEKEEPING_ENABLED=false)")
+            return None
+        print(f"🧹 Running git housekeeping in {self.repo_dir}...")
+        with tracer.context(repo=f"{self.repo_owner}/{self.repo_name}"):
+            return self.housekeeper.run_pass(force=True)
     
     def run_immediately(self):
         print("🧪 Running commit immediately for testing...")
-        self.create_commit()
+        with tracer.context(repo=f"{self.repo_owner}/{self.repo_name}"):
+            self.create_commit()
+
+def print_trace_summary():
+    if not tracer.enabled:
+        return
+    tracer.flush()
+    timings = tracer.summary()
+    parts = [f"{name} {timings[name][1] * 1000:.1f}ms" for name in tracing.PHASES if name in timings]
+    print(f"⏱️  Phases: {', '.join(parts)}")
+
+def parse_duration(value):
+    """Parse a duration such as 90s, 45m, 12h or 7d"""
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+    try:
+        return timedelta(**{units[value[-1]]: float(value[:-1])})
+    except (KeyError, ValueError, IndexError):
+        raise argparse.ArgumentTypeError(f"invalid duration {value!r} (use e.g. 90s, 45m, 12h, 7d)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GitHub Daily Commit Bot")
+    parser.add_argument("--test", action="store_true",
+                        help="create a commit immediately and exit")
+    parser.add_argument("--remote-only", action="store_true",
+                        help="commit through the GitHub API without a local clone")
+    parser.add_argument("--manifest",
+                        help="JSON/YAML/TOML list of repositories to drive from one process")
+    parser.add_argument("--concurrency", type=int,
+                        help="parallel repositories for --manifest (default: FLEET_CONCURRENCY)")
+    parser.add_argument("--batch", type=int, metavar="N",
+                        help="create N commits and push them in a single push, then exit")
+    parser.add_argument("--spread-over", type=parse_duration, metavar="DURATION",
+                        help="spread --batch timestamps over this period ending now (e.g. 7d)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run as a daemon controlled through botctl.py")
+    parser.add_argument("--backfill", type=parse_duration, metavar="DURATION",
+                        help="commit once on every day without a commit in this period (e.g. 30d), then exit")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="with --backfill, only print the planned commits")
+    parser.add_argument("--stats", action="store_true",
+                        help="print commit counts, a per-day histogram and streaks, then exit")
+    parser.add_argument("--maintenance", action="store_true",
+                        help="repack the clone and write the commit-graph now, then exit")
+    parser.add_argument("--trace", action="store_true",
+                        help="record per-phase timings (TRACE_PATH / TRACE_METRICS_PATH)")
+    return parser.parse_args(argv)
 
 def main():
     print("🚀 GitHub Daily Commit Bot Starting...")
     
     try:
+        args = parse_args()
+        if args.remote_only:
+            Config.REMOTE_ONLY = True
+        if args.trace:
+            tracing.enable()
+        
+        if args.daemon:
+            from daemon import run_daemon
+            # Flags win over .env when the daemon reloads its configuration
+            overrides = {"REMOTE_ONLY": True} if args.remote_only else {}
+            run_daemon(args.manifest, args.concurrency, overrides)
+            return
+        
+        if args.manifest:
+            from fleet import run_fleet
+            run_fleet(args.manifest, args.concurrency, once=args.test)
+            return
+        
         bot = GitHubCommitBot()
         
-        if len(os.sys.argv) > 1 and os.sys.argv[1] == "--test":
+        if args.test:
             bot.run_immediately()
+            print_trace_summary()
+            return
+        
+        if args.batch:
+            bot.create_commits(args.batch, args.spread_over)
+            print_trace_summary()
+            return
+        
+        if args.backfill:
+            bot.backfill(args.backfill, args.dry_run)
             return
         
-        for time_str in Config.COMMIT_TIMES:
-            schedule.every().day.at(time_str).do(bot.run_daily_commit)
+        if args.maintenance:
+            bot.run_maintenance()
+            return
+        
+        if args.stats:
+            from history_stats import print_stats
+            print_stats(*bot.history_stats())
+            return
+        
+        from scheduler import AsyncScheduler
+        from schedule_planner import commit_times_for
+        
+        # Jobs share one clone, so they never overlap
+        scheduler = AsyncScheduler(max_concurrency=1)
+        commit_times = commit_times_for(f"{bot.repo_owner}/{bot.repo_name}")
+        for time_str in commit_times:
+            scheduler.every_day_at(time_str, bot.run_daily_commit)
+        # Housekeeping runs on its own thread, between the commit times
+        bot.start_housekeeping(commit_times)
         
         print("📅 Bot scheduled! Commits will be created at:")
-        for time_str in Config.COMMIT_TIMES:
+        for time_str in commit_times:
             print(f"   - {time_str}")
         print("\n💡 Run with --test flag to create a commit immediately")
+        print("💡 Add --remote-only to commit through the GitHub API without a local clone")
+        print("💡 Use --manifest repos.yaml to drive many repositories from one process")
+        print(f"⏭️  Next commit at {scheduler.next_fire_time():%Y-%m-%d %H:%M:%S}")
         print("🛑 Press Ctrl+C to stop the bot")
         
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        scheduler.run_forever()
             
     except KeyboardInterrupt:
         print("\n👋 Bot stopped by user")
@@ -14,6 +14,8 @@ class Config:
     GITHUB_USERNAME = os.getenv('GITHUB_USERNAME')
     GITHUB_REPO = os.getenv('GITHUB_REPO')
     REPO_OWNER = os.getenv('REPO_OWNER')
+    GITHUB_BRANCH = os.getenv('GITHUB_BRANCH')
+    GITHUB_API_URL = os.getenv('GITHUB_API_URL')
     
     if not GITHUB_USERNAME:
         GITHUB_USERNAME = 'nikhil-shr-23'
@@ -21,9 +23,74 @@ class Config:
         REPO_OWNER = 'nikhil-shr-23'
     if not GITHUB_REPO:
         GITHUB_REPO = 'Gitgremlin'
+    if not GITHUB_BRANCH:
+        GITHUB_BRANCH = 'main'
+    if not GITHUB_API_URL:
+        GITHUB_API_URL = 'https://api.github.com'
     
     COMMIT_TIMES = ['09:00', '14:17','15:30', '21:45']
+    # e.g. "4@09:00-12:00,14:00-22:00": 4 fire times a day per repository, spread over those windows
+    SCHEDULE_POLICY = os.getenv('SCHEDULE_POLICY') or ''
     CONTRIBUTIONS_DIR = 'contributions'  
+    CONTRIBUTIONS_LAYOUT = os.getenv('CONTRIBUTIONS_LAYOUT') or 'flat'
+    # Contribution content: markdown, json or changelog; CONTENT_TEMPLATE overrides the markdown or changelog template
+    CONTENT_GENERATOR = os.getenv('CONTENT_GENERATOR') or 'markdown'
+    CONTENT_TEMPLATE = os.getenv('CONTENT_TEMPLATE') or ''
+    CHANGELOG_PATH = os.getenv('CHANGELOG_PATH') or 'CHANGELOG.md'
+    LEDGER_PATH = os.getenv('LEDGER_PATH') or 'commit_ledger.sqlite3'
+    LEDGER_TTL = int(os.getenv('LEDGER_TTL') or 3600)
+    GIT_BACKEND = os.getenv('GIT_BACKEND') or 'object'
+    FASTIMPORT_CHECKPOINT = int(os.getenv('FASTIMPORT_CHECKPOINT') or 100)
+    # A push rejected because another writer moved the branch is rebased onto the new tip and retried
+    # up to PUSH_ATTEMPTS times, with up to PUSH_RETRY_JITTER seconds (times the attempt) between tries
+    PUSH_ATTEMPTS = int(os.getenv('PUSH_ATTEMPTS') or 5)
+    PUSH_RETRY_JITTER = float(os.getenv('PUSH_RETRY_JITTER') or 0.5)
+    # Failed pushes are retried after OUTBOX_BASE_DELAY seconds, doubling up to OUTBOX_MAX_DELAY
+    OUTBOX_BASE_DELAY = float(os.getenv('OUTBOX_BASE_DELAY') or 30)
+    OUTBOX_MAX_DELAY = float(os.getenv('OUTBOX_MAX_DELAY') or 3600)
+    # Git housekeeping between commit times: repack once this many loose objects or packs pile up,
+    # in idle windows of at least HOUSEKEEPING_MIN_IDLE seconds kept HOUSEKEEPING_MARGIN away from a commit
+    HOUSEKEEPING_ENABLED = (os.getenv('HOUSEKEEPING_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+    HOUSEKEEPING_LOOSE_OBJECTS = int(os.getenv('HOUSEKEEPING_LOOSE_OBJECTS') or 200)
+    HOUSEKEEPING_MAX_PACKS = int(os.getenv('HOUSEKEEPING_MAX_PACKS') or 10)
+    HOUSEKEEPING_MIN_IDLE = int(os.getenv('HOUSEKEEPING_MIN_IDLE') or 1800)
+    HOUSEKEEPING_MARGIN = int(os.getenv('HOUSEKEEPING_MARGIN') or 300)
+    HOUSEKEEPING_PRUNE_EXPIRE = os.getenv('HOUSEKEEPING_PRUNE_EXPIRE') or '2.weeks.ago'
+    # bootstrap.py: commits of history a new runner fetches (more are fetched when a push needs them)
+    BOOTSTRAP_DEPTH = int(os.getenv('BOOTSTRAP_DEPTH') or 1)
+    REMOTE_ONLY = (os.getenv('REMOTE_ONLY') or '').lower() in ('1', 'true', 'yes')
+    FLEET_CONCURRENCY = int(os.getenv('FLEET_CONCURRENCY') or 8)
+    SCHEDULER_CONCURRENCY = int(os.getenv('SCHEDULER_CONCURRENCY') or 4)
+    
+    # Shared HTTP client (set HTTP_CACHE_PATH to an empty value to disable the ETag cache)
+    HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', 'http_cache.sqlite3')
+    # Responses unused for this many days, and the least recently used beyond the entry cap, are dropped
+    HTTP_CACHE_MAX_AGE_DAYS = float(os.getenv('HTTP_CACHE_MAX_AGE_DAYS') or 7)
+    HTTP_CACHE_MAX_ENTRIES = int(os.getenv('HTTP_CACHE_MAX_ENTRIES') or 2000)
+    HTTP_TIMEOUT = int(os.getenv('HTTP_TIMEOUT') or 15)
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES') or 3)
+    HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF') or 0.5)
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE') or 10)
+    
+    # Rate-limit governor (set GOVERNOR_STATE_PATH to share the budget between processes)
+    GOVERNOR_STATE_PATH = os.getenv('GOVERNOR_STATE_PATH') or ''
+    GOVERNOR_BURST = int(os.getenv('GOVERNOR_BURST') or 10)
+    GOVERNOR_PACE_BELOW = float(os.getenv('GOVERNOR_PACE_BELOW') or 0.5)
+    GOVERNOR_MAX_WAIT = int(os.getenv('GOVERNOR_MAX_WAIT') or 300)
+    GOVERNOR_RETRIES = int(os.getenv('GOVERNOR_RETRIES') or 2)
+    
+    # Per-phase timing (also enabled by --trace); empty paths disable that export
+    TRACE_ENABLED = (os.getenv('TRACE_ENABLED') or '').lower() in ('1', 'true', 'yes')
+    TRACE_PATH = os.getenv('TRACE_PATH', 'trace.jsonl')
+    TRACE_METRICS_PATH = os.getenv('TRACE_METRICS_PATH', 'trace_metrics.prom')
+    
+    # diagnose.py / test_bot.py: per-probe timeout and how long network results are reused
+    DIAGNOSTICS_TIMEOUT = float(os.getenv('DIAGNOSTICS_TIMEOUT') or 10)
+    DIAGNOSTICS_CACHE_TTL = float(os.getenv('DIAGNOSTICS_CACHE_TTL') or 60)
+    DIAGNOSTICS_CACHE_PATH = os.getenv('DIAGNOSTICS_CACHE_PATH', 'diagnostics_cache.json')
+    
+    # Daemon control socket (relative paths live next to the bot)
+    DAEMON_SOCKET = os.getenv('DAEMON_SOCKET') or 'gitgremlin.sock'
     
 
     COMMIT_MESSAGES = [
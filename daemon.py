@@ -0,0 +1,212 @@
+"""
+Daemon mode for GitHub Commit Bot
+Keeps the GitHub client, repository handles and schedule warm in one
+process and takes commands over a Unix domain socket (see botctl.py).
+"""
+
+import asyncio
+import importlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+import config
+from config import Config
+from fleet import FleetRunner, RepoSpec, load_manifest
+from governor import get_governor
+from scheduler import AsyncScheduler, Job
+
+COMMANDS = ("status", "commit-now", "pause", "resume", "reload", "stop")
+
+
+def socket_path():
+    path = Config.DAEMON_SOCKET
+    return path if os.path.isabs(path) else os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+def reload_config(overrides=None):
+    """Re-read .env and config.py into the existing Config class
+
+    Every module holds a reference to the original class, so the new values
+    are copied onto it instead of swapping the class out. `overrides` (from
+    command-line flags) are applied on top.
+    """
+    load_dotenv(override=True)
+    fresh = importlib.reload(config).Config
+    config.Config = Config
+    for name, value in vars(fresh).items():
+        if name.isupper():
+            setattr(Config, name, value)
+    for name, value in (overrides or {}).items():
+        setattr(Config, name, value)
+
+
+class BotDaemon:
+    """Scheduler plus control socket around a FleetRunner"""
+
+    def __init__(self, manifest=None, concurrency=None, path=None, overrides=None):
+        self.manifest = manifest
+        self.concurrency = concurrency
+        self.overrides = overrides or {}
+        self.path = path or socket_path()
+        self.paused = False
+        self.started = time.time()
+        self.last_results = {}
+        self.runner = None
+        self.scheduler = AsyncScheduler(max_concurrency=Config.SCHEDULER_CONCURRENCY)
+        self._cycle_lock = threading.Lock()
+        self._server = None
+        self._load()
+
+    def _specs(self):
+        if self.manifest:
+            specs, settings = load_manifest(self.manifest)
+            return specs, self.concurrency or settings.get("concurrency")
+        spec = RepoSpec(Config.REPO_OWNER, Config.GITHUB_REPO, Config.GITHUB_BRANCH,
+                        remote_only=Config.REMOTE_ONLY)
+        # A single clone must not run two commits at once
+        return [spec], 1
+
+    def _load(self):
+        specs, concurrency = self._specs()
+        old = self.runner
+        self.runner = FleetRunner(specs, concurrency)
+        if old is not None:
+            # Keep warm bots (and their repository handles) whose settings did not change, unless a
+            # rotated GITHUB_TOKEN or a new GITHUB_API_URL means the client itself must be rebuilt
+            unchanged = set()
+            if old.credentials == self.runner.credentials:
+                unchanged = {s.full_name for s in specs if any(vars(s) == vars(o) for o in old.specs)}
+                self.runner._github = old._github
+            self.runner._bots = {name: bot for name, bot in old._bots.items() if name in unchanged}
+            old.shutdown()
+            for name, bot in old._bots.items():
+                if name not in unchanged and bot.housekeeper:
+                    bot.housekeeper.stop()
+
+        # Swap the job list in one assignment; reload runs off the event loop thread
+        jobs = []
+        for time_str in self.runner.commit_times():
+            job = Job(time_str, self._scheduled_cycle, (time_str,), name=f"daemon@{time_str}")
+            job.schedule_next(self.scheduler.clock())
+            jobs.append(job)
+        self.scheduler.jobs = jobs
+        self.scheduler._notify()
+
+    def _run(self, time_str=None, action=None, repo=None):
+        if repo and repo not in {spec.full_name for spec in self.runner.specs}:
+            raise ValueError(f"Unknown repository: {repo}")
+        with self._cycle_lock:
+            results = self.runner.run_cycle(time_str, action, repos=[repo] if repo else None)
+        for result in results:
+            self.last_results[result["repo"]] = dict(result, at=datetime.now().isoformat(timespec="seconds"))
+        return results
+
+    def _scheduled_cycle(self, time_str):
+        if self.paused:
+            print(f"⏸️  Daemon paused, skipping {time_str} cycle")
+            return
+        self._run(time_str)
+
+    # -- commands ------------------------------------------------------------
+
+    def status(self):
+        metrics = self.scheduler.metrics()
+        return {
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started),
+            "paused": self.paused,
+            "repos": [spec.full_name for spec in self.runner.specs],
+            "warm_bots": sorted(self.runner._bots),
+            "next_fire_time": metrics["next_fire_time"],
+            "jobs": metrics["jobs"],
+            "last_results": self.last_results,
+            "outbox": {name: bot.outbox.depth() for name, bot in self.runner._bots.items()},
+            "contention": {name: bot.git.push_stats.as_dict() for name, bot in self.runner._bots.items()
+                           if bot.git.push_stats.pushes},
+            "housekeeping": {name: bot.housekeeper.last_pass for name, bot in self.runner._bots.items()
+                             if bot.housekeeper and bot.housekeeper.last_pass},
+            "rate_limit": get_governor().metrics(),
+            "http_cache": self.runner.http_cache(),
+        }
+
+    async def dispatch(self, request):
+        command = request.get("command")
+        loop = asyncio.get_running_loop()
+        if command == "status":
+            return self.status()
+        if command == "commit-now":
+            repo = request.get("repo")
+            results = await loop.run_in_executor(
+                None, lambda: self._run(action=lambda bot: bot.create_commit(), repo=repo)
+            )
+            return {"results": results}
+        if command == "pause":
+            self.paused = True
+            print("⏸️  Daemon paused")
+            return {"paused": True}
+        if command == "resume":
+            self.paused = False
+            print("▶️  Daemon resumed")
+            return {"paused": False}
+        if command == "reload":
+            await loop.run_in_executor(None, self._reload)
+            return {"repos": [spec.full_name for spec in self.runner.specs],
+                    "next_fire_time": self.scheduler.next_fire_time()}
+        if command == "stop":
+            self.scheduler.stop()
+            return {"stopping": True}
+        raise ValueError(f"Unknown command: {command!r} (choose from {', '.join(COMMANDS)})")
+
+    def _reload(self):
+        with self._cycle_lock:
+            reload_config(self.overrides)
+            self._load()
+        print("🔄 Daemon configuration reloaded")
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = dict(await self.dispatch(json.loads(line)), ok=True)
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response, default=str).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o600)
+        print(f"🔌 Control socket listening on {self.path}")
+        try:
+            await self.scheduler.run()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self.runner.shutdown()
+
+    def run_forever(self):
+        asyncio.run(self.serve())
+
+
+def run_daemon(manifest=None, concurrency=None, overrides=None):
+    daemon = BotDaemon(manifest, concurrency, overrides=overrides)
+    print(f"👹 Daemon started for {len(daemon.runner.specs)} repositories (pid {os.getpid()})")
+    next_run = daemon.scheduler.next_fire_time()
+    if next_run:
+        print(f"⏭️  Next cycle at {next_run:%Y-%m-%d %H:%M:%S}")
+    print("💡 Control it with: python botctl.py status | commit-now | pause | resume | reload | stop")
+    daemon.run_forever()
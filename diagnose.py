@@ -3,125 +3,85 @@
 Diagnostic script to troubleshoot GitHub repository connection issues
 """
 
-import os
+import argparse
+import json
 import sys
-from github import Github
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-def test_github_token():
-    """Test if GitHub token is valid"""
-    print("🔑 Testing GitHub token...")
-    
-    token = os.getenv('GITHUB_TOKEN')
-    if not token:
-        print("❌ No GITHUB_TOKEN found in .env file")
-        return False
-    
-    if token == "your_github_token_here":
-        print("❌ GITHUB_TOKEN is still set to placeholder value")
-        print("💡 Please replace 'your_github_token_here' with your actual GitHub token")
-        return False
-    
-    try:
-        github = Github(token)
-        user = github.get_user()
-        print(f"✅ Token is valid! Connected as: {user.login}")
-        return True
-    except Exception as e:
-        print(f"❌ Token is invalid: {e}")
-        return False
+from config import Config
+from diagnostics import open_cache, print_report, run_diagnostics, run_fleet_diagnostics
+from fleet import RepoSpec, load_manifest
 
-def test_repository_access():
-    """Test repository access"""
-    print("\n🔍 Testing repository access...")
-    
-    token = os.getenv('GITHUB_TOKEN')
-    username = os.getenv('GITHUB_USERNAME', 'nikhil-shr-23')
-    repo_name = os.getenv('GITHUB_REPO', 'Gitgremlin')
-    repo_owner = os.getenv('REPO_OWNER', 'nikhil-shr-23')
-    
-    print(f"Repository: {repo_owner}/{repo_name}")
-    
-    try:
-        github = Github(token)
-        repo = github.get_repo(f"{repo_owner}/{repo_name}")
-        print(f"✅ Repository access successful!")
-        print(f"   Full name: {repo.full_name}")
-        print(f"   Private: {repo.private}")
-        print(f"   URL: {repo.html_url}")
-        
-        # Check if repository is empty
-        try:
-            commits = list(repo.get_commits())
-            if not commits:
-                print("📝 Repository is empty (no commits yet)")
-            else:
-                print(f"📊 Repository has {len(commits)} commits")
-        except Exception as e:
-            print(f"📝 Repository appears to be empty: {e}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Repository access failed: {e}")
-        return False
+LABELS = {
+    "config": "Environment",
+    "dependencies": "Dependencies",
+    "token": "GitHub token",
+    "repository": "Repository access",
+    "git": "Local git state",
+}
 
-def test_environment():
-    """Test environment configuration"""
-    print("\n⚙️  Testing environment configuration...")
-    
-    required_vars = ['GITHUB_TOKEN', 'GITHUB_USERNAME', 'GITHUB_REPO', 'REPO_OWNER']
-    
-    for var in required_vars:
-        value = os.getenv(var)
-        if not value:
-            print(f"❌ {var} is not set")
-        elif value == "your_github_token_here" and var == "GITHUB_TOKEN":
-            print(f"❌ {var} is still set to placeholder")
-        else:
-            print(f"✅ {var}: {value}")
+def parse_args():
+    parser = argparse.ArgumentParser(description="GitHub Commit Bot - Diagnostic Tool")
+    parser.add_argument("--manifest", help="diagnose every repository of a fleet manifest")
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    parser.add_argument("--timeout", type=float, help="seconds each probe may take (default: DIAGNOSTICS_TIMEOUT)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached token/repository results")
+    return parser.parse_args()
+
+def print_fixes(report):
+    probes = report["probes"]
+    if probes["token"]["status"] != "pass":
+        print("\n🔧 To fix token issues:")
+        print("1. Go to https://github.com/settings/tokens")
+        print("2. Generate new token (classic)")
+        print("3. Select 'repo' scope")
+        print("4. Copy token and update .env file")
+    elif probes["repository"]["status"] not in ("pass", "warn"):
+        print("\n🔧 To fix repository issues:")
+        print("1. Make sure the repository exists")
+        print("2. Check repository name and owner")
+        print("3. Ensure your token has access to the repository")
 
 def main():
     """Run all diagnostics"""
+    args = parse_args()
+    cache = None if args.no_cache else open_cache()
+
+    if args.manifest:
+        specs, settings = load_manifest(args.manifest)
+        reports = run_fleet_diagnostics(specs, timeout=args.timeout, cache=cache,
+                                        concurrency=settings.get("concurrency"))
+    else:
+        spec = RepoSpec(Config.REPO_OWNER, Config.GITHUB_REPO, remote_only=Config.REMOTE_ONLY)
+        reports = [run_diagnostics(spec, timeout=args.timeout, cache=cache)]
+    if cache:
+        cache.save()
+
+    if args.json:
+        document = reports if args.manifest else reports[0]
+        print(json.dumps(document, indent=2))
+        return 0 if all(report["ok"] for report in reports) else 1
+
     print("🔧 GitHub Commit Bot - Diagnostic Tool")
     print("=" * 50)
-    
-    # Test environment
-    test_environment()
-    
-    # Test token
-    token_valid = test_github_token()
-    
-    # Test repository access
-    if token_valid:
-        repo_access = test_repository_access()
-    else:
-        repo_access = False
-    
+    for report in reports:
+        print_report(report, LABELS)
+
     print("\n" + "=" * 50)
     print("📊 Diagnostic Results:")
-    
-    if token_valid and repo_access:
+
+    failed = [report for report in reports if not report["ok"]]
+    if not failed:
         print("🎉 Everything looks good! The bot should work.")
         print("💡 Try running: python commit_bot.py --test")
-    else:
-        print("💥 Issues found. Please fix the problems above.")
-        
-        if not token_valid:
-            print("\n🔧 To fix token issues:")
-            print("1. Go to https://github.com/settings/tokens")
-            print("2. Generate new token (classic)")
-            print("3. Select 'repo' scope")
-            print("4. Copy token and update .env file")
-        
-        if not repo_access and token_valid:
-            print("\n🔧 To fix repository issues:")
-            print("1. Make sure the repository exists")
-            print("2. Check repository name and owner")
-            print("3. Ensure your token has access to the repository")
+        return 0
+
+    print(f"💥 Issues found in {len(failed)}/{len(reports)} repositories. Please fix the problems above.")
+    print_fixes(failed[0])
+    return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Diagnostics engine for GitHub Commit Bot
+Runs independent probes (configuration, dependencies, token, repository access,
+local git state) in parallel with a timeout each, caches network results for a
+short while and returns a JSON-friendly report. Used by diagnose.py and
+test_bot.py.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from config import Config
+from governor import request_priority
+
+PASS, WARN, FAIL, SKIP, TIMEOUT, ERROR = "pass", "warn", "fail", "skip", "timeout", "error"
+STATUS_ICONS = {PASS: "✅", WARN: "⚠️ ", FAIL: "❌", SKIP: "⏭️ ", TIMEOUT: "⏱️ ", ERROR: "💥"}
+PLACEHOLDERS = {"your_github_token_here", "your_github_username", "your_repo_name", "your_username_or_org"}
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Probe:
+    """One named check: func(spec) -> (status, message, details)"""
+
+    def __init__(self, name, func, depends=(), cacheable=False):
+        self.name = name
+        self.func = func
+        self.depends = depends
+        self.cacheable = cacheable
+
+
+# -- probes ------------------------------------------------------------------
+
+def check_config(spec):
+    try:
+        Config.validate()
+    except ValueError as e:
+        return FAIL, str(e), {}
+    placeholders = [var for var in ("GITHUB_TOKEN", "GITHUB_USERNAME", "GITHUB_REPO", "REPO_OWNER")
+                    if os.getenv(var) in PLACEHOLDERS]
+    details = {"username": Config.GITHUB_USERNAME, "repository": spec.full_name,
+               "commit_times": spec.schedule}
+    if placeholders:
+        return FAIL, f"Still set to placeholder values: {', '.join(placeholders)}", details
+    return PASS, "Configuration is valid", details
+
+
+def check_dependencies(spec):
+    required = {"github": "PyGithub", "dotenv": "python-dotenv", "requests": "requests"}
+    missing = [package for module, package in required.items() if importlib.util.find_spec(module) is None]
+    details = {"missing": missing, "yaml": importlib.util.find_spec("yaml") is not None}
+    if missing:
+        return FAIL, f"Not installed: {', '.join(missing)} (pip install -r requirements.txt)", details
+    return PASS, "All required packages are installed", details
+
+
+def check_token(spec):
+    from github_client import get_github
+
+    with request_priority("low"):
+        login = get_github(Config.GITHUB_TOKEN).get_user().login
+    return PASS, f"Connected as {login}", {"login": login}
+
+
+def check_repository(spec):
+    from github_client import get_github
+    from history_stats import remote_commit_count
+
+    with request_priority("low"):
+        repo = get_github(Config.GITHUB_TOKEN).get_repo(spec.full_name)
+        commits = remote_commit_count(repo, spec.branch)
+    details = {"full_name": repo.full_name, "private": repo.private, "url": repo.html_url,
+               "branch": spec.branch, "commits": commits}
+    if not commits:
+        return WARN, "Repository is empty (no commits yet) - this is normal for new repos", details
+    return PASS, f"{repo.full_name} has {commits} commits on {spec.branch}", details
+
+
+def _git(args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+
+
+def check_git(spec):
+    if spec.remote_only:
+        return SKIP, "Remote-only repository, no local clone needed", {}
+    path = spec.path or SCRIPT_DIR
+    if _git(["rev-parse", "--is-inside-work-tree"], path).returncode != 0:
+        return FAIL, f"{path} is not a git repository (run: git init)", {"path": path}
+    head = _git(["log", "--oneline", "-1", spec.branch, "--"], path).stdout.strip()
+    dirty = len(_git(["status", "--porcelain"], path).stdout.splitlines())
+    origin = _git(["remote", "get-url", "origin"], path).stdout.strip()
+    ahead = _git(["rev-list", "--count", f"origin/{spec.branch}..{spec.branch}", "--"], path)
+    details = {"path": path, "head": head, "dirty_files": dirty, "origin": origin,
+               "unpushed": int(ahead.stdout) if ahead.returncode == 0 else None}
+    if not head:
+        return WARN, f"No commits on {spec.branch} yet", details
+    if not origin:
+        return WARN, "No origin remote configured", details
+    return PASS, f"Latest commit: {head}", details
+
+
+PROBES = {
+    probe.name: probe for probe in (
+        Probe("config", check_config),
+        Probe("dependencies", check_dependencies),
+        Probe("token", check_token, depends=("config", "dependencies"), cacheable=True),
+        Probe("repository", check_repository, depends=("token",), cacheable=True),
+        Probe("git", check_git),
+    )
+}
+
+
+# -- cache -------------------------------------------------------------------
+
+class ResultCache:
+    """Probe results in a small JSON file, valid for `ttl` seconds and for the current token only"""
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._fingerprint = hashlib.sha256((Config.GITHUB_TOKEN or "").encode()).hexdigest()[:16]
+        try:
+            with open(path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry["fingerprint"] == self._fingerprint and time.time() - entry["at"] < self.ttl:
+            return entry["result"]
+        return None
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = {"at": time.time(), "fingerprint": self._fingerprint, "result": result}
+
+    def save(self):
+        now = time.time()
+        with self._lock:
+            entries = {k: v for k, v in self._entries.items() if now - v["at"] < self.ttl}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # the cache is only an optimisation
+
+
+def open_cache(ttl=None):
+    path = Config.DIAGNOSTICS_CACHE_PATH
+    if not path:
+        return None
+    if not os.path.isabs(path):
+        path = os.path.join(SCRIPT_DIR, path)
+    return ResultCache(path, Config.DIAGNOSTICS_CACHE_TTL if ttl is None else ttl)
+
+
+# -- engine ------------------------------------------------------------------
+
+def _run_probe(probe, spec):
+    start = time.perf_counter()
+    try:
+        status, message, details = probe.func(spec)
+    except Exception as e:
+        status, message, details = ERROR, str(e), {}
+    return {"status": status, "message": message, "details": details,
+            "seconds": round(time.perf_counter() - start, 3), "cached": False}
+
+
+def run_diagnostics(spec, names=None, timeout=None, cache=None, known=None):
+    """Run the probes `names` (default: all) for `spec` and return a report dict
+
+    Probes start as soon as the ones they depend on have passed, each gets
+    `timeout` seconds, and `known` results (e.g. shared across a fleet) are
+    reused instead of running those probes again.
+    """
+    timeout = Config.DIAGNOSTICS_TIMEOUT if timeout is None else timeout
+    probes = [PROBES[name] for name in (names or PROBES)]
+    results = dict(known or {})
+    started = time.perf_counter()
+    pending = [probe for probe in probes if probe.name not in results]
+    in_run = {probe.name for probe in probes} | set(results)
+    running = {}  # future -> (probe, cache key, deadline)
+    pool = ThreadPoolExecutor(max_workers=max(len(pending), 1), thread_name_prefix="probe")
+    try:
+        while pending or running:
+            for probe in list(pending):
+                # Dependencies that are not part of this run are not waited for
+                deps = [dep for dep in probe.depends if dep in in_run]
+                if any(dep not in results for dep in deps):
+                    continue
+                pending.remove(probe)
+                failed = [dep for dep in deps if results[dep]["status"] not in (PASS, WARN)]
+                if failed:
+                    results[probe.name] = {"status": SKIP, "message": f"Skipped, {', '.join(failed)} failed",
+                                           "details": {}, "seconds": 0.0, "cached": False}
+                    continue
+                key = f"{probe.name}:{spec.full_name}:{spec.branch}"
+                cached = cache.get(key) if cache and probe.cacheable else None
+                if cached:
+                    results[probe.name] = dict(cached, cached=True)
+                    continue
+                future = pool.submit(_run_probe, probe, spec)
+                running[future] = (probe, key, time.perf_counter() + timeout)
+            if not running:
+                continue
+
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            done, _ = wait(running, timeout=max(0.0, next_deadline - time.perf_counter()),
+                           return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            for future in list(running):
+                probe, key, deadline = running[future]
+                if future in done:
+                    results[probe.name] = future.result()
+                    if cache and probe.cacheable and results[probe.name]["status"] in (PASS, WARN):
+                        cache.put(key, results[probe.name])
+                elif now >= deadline:
+                    results[probe.name] = {"status": TIMEOUT, "message": f"No answer within {timeout:g}s",
+                                           "details": {}, "seconds": timeout, "cached": False}
+                else:
+                    continue
+                del running[future]
+    finally:
+        # A timed-out probe keeps its thread until it returns; don't wait for it
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    ordered = {probe.name: results[probe.name] for probe in probes}
+    return {
+        "repo": spec.full_name,
+        "branch": spec.branch,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "ok": all(result["status"] in (PASS, WARN, SKIP) for result in ordered.values()),
+        "probes": ordered,
+    }
+
+
+def run_fleet_diagnostics(specs, names=None, timeout=None, cache=None, concurrency=None):
+    """Diagnose many repositories; repository-independent probes run only once"""
+    names = list(names or PROBES)
+    shared_names = [name for name in ("config", "dependencies", "token") if name in names]
+    shared = run_diagnostics(specs[0], shared_names, timeout, cache)["probes"] if specs else {}
+    with ThreadPoolExecutor(max_workers=concurrency or Config.FLEET_CONCURRENCY,
+                            thread_name_prefix="diagnose") as pool:
+        return list(pool.map(lambda spec: run_diagnostics(spec, names, timeout, cache, shared), specs))
+
+
+def print_report(report, labels=None):
+    """Print one report in the scripts' emoji style; `labels` renames probes"""
+    print(f"\n📋 {report['repo']} ({report['branch']})")
+    for name, result in report["probes"].items():
+        label = (labels or {}).get(name, name)
+        cached = ", cached" if result["cached"] else ""
+        print(f"{STATUS_ICONS[result['status']]} {label}: {result['message']} ({result['seconds']:.2f}s{cached})")
@@ -0,0 +1,207 @@
+"""
+Multi-repository mode for GitHub Commit Bot
+Drives every repository listed in a manifest from one process through a
+bounded thread pool sharing a single GitHub client.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from governor import get_governor
+from schedule_planner import commit_times_for
+
+
+class RepoSpec:
+    """One manifest entry: which repository to commit to, and when"""
+
+    def __init__(self, owner, repo, branch=None, schedule=None, path=None, remote_only=None, policy=None):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch or Config.GITHUB_BRANCH
+        self.policy = policy
+        # An explicit schedule wins; otherwise the policy (or SCHEDULE_POLICY) spreads the fire times
+        self.schedule = list(schedule) if schedule else commit_times_for(self.full_name, policy)
+        self.path = path
+        self.remote_only = remote_only
+
+    @property
+    def full_name(self):
+        return f"{self.owner}/{self.repo}"
+
+
+def _parse_manifest(path):
+    with open(path) as f:
+        text = f.read()
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML: pip install pyyaml")
+        return yaml.safe_load(text)
+    if path.endswith(".toml"):
+        import tomllib
+        return tomllib.loads(text)
+    return json.loads(text)
+
+
+def load_manifest(path):
+    """Read a JSON, YAML or TOML manifest into (specs, settings)
+
+    The manifest is either a list of repository entries or a mapping with a
+    `repos` list plus optional `defaults` and `concurrency` keys.
+    """
+    data = _parse_manifest(path)
+    if isinstance(data, list):
+        data = {"repos": data}
+
+    defaults = data.get("defaults", {})
+    base_dir = os.path.dirname(os.path.abspath(path))
+    specs = []
+    clones = {}
+    for entry in data.get("repos", []):
+        entry = dict(defaults, **entry)
+        missing = [key for key in ("owner", "repo") if not entry.get(key)]
+        remote_only = Config.REMOTE_ONLY if entry.get("remote_only") is None else entry["remote_only"]
+        if not remote_only and not entry.get("path"):
+            # Without a path the bot would commit into its own checkout
+            missing.append("path (or remote_only: true)")
+        if missing:
+            raise ValueError(f"Manifest entry {entry} is missing: {', '.join(missing)}")
+        if entry.get("path"):
+            entry["path"] = os.path.join(base_dir, os.path.expanduser(entry["path"]))
+            if not remote_only:
+                clone = os.path.realpath(entry["path"])
+                name = f"{entry['owner']}/{entry['repo']}"
+                if clone in clones:
+                    raise ValueError(f"Manifest entries {clones[clone]} and {name} share the clone {clone}")
+                clones[clone] = name
+        specs.append(RepoSpec(
+            entry["owner"], entry["repo"], entry.get("branch"), entry.get("schedule"),
+            entry.get("path"), entry.get("remote_only"), entry.get("policy"),
+        ))
+    settings = {key: value for key, value in data.items() if key not in ("repos", "defaults")}
+    return specs, settings
+
+
+class FleetRunner:
+    """Run the daily commit for many repositories with bounded concurrency"""
+
+    def __init__(self, specs, concurrency=None, github=None, housekeeping=True):
+        self.specs = specs
+        self.concurrency = concurrency or Config.FLEET_CONCURRENCY
+        self.housekeeping = housekeeping
+        # The shared client and warm bots are bound to these; a reload that changes them starts fresh
+        self.credentials = (Config.GITHUB_TOKEN, Config.GITHUB_API_URL)
+        self._github = github
+        self._bots = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fleet")
+
+    @property
+    def github(self):
+        # One client for the whole fleet so HTTP connections to the API host are reused
+        if self._github is None:
+            from github_client import get_github
+            self._github = get_github(pool_size=self.concurrency)
+        return self._github
+
+    def http_cache(self):
+        """Hits, misses and hit rate of the shared client's ETag cache, or None before it exists"""
+        if self._github is None:
+            return None
+        from github_client import cache_stats
+        hits, misses = cache_stats(self._github)
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
+
+    def get_bot(self, spec):
+        with self._lock:
+            bot = self._bots.get(spec.full_name)
+        if bot is None:
+            from commit_bot import GitHubCommitBot
+            bot = GitHubCommitBot(spec.owner, spec.repo, spec.branch, spec.path,
+                                  spec.remote_only, github=self.github)
+            if self.housekeeping:
+                bot.start_housekeeping(spec.schedule)
+            with self._lock:
+                self._bots[spec.full_name] = bot
+        return bot
+
+    def _run_one(self, spec, action):
+        start = time.perf_counter()
+        try:
+            ok = bool(action(self.get_bot(spec)))
+            error = None
+        except Exception as e:
+            ok, error = False, str(e)
+        return {"repo": spec.full_name, "ok": ok, "error": error,
+                "seconds": time.perf_counter() - start}
+
+    def run_cycle(self, time_str=None, action=None, repos=None):
+        """Run `action` (the daily commit by default) for every due repository
+
+        `repos` restricts the cycle to those full names. Failures stay
+        isolated to their repository. Returns per-repo results.
+        """
+        action = action or (lambda bot: bot.run_daily_commit())
+        specs = [s for s in self.specs if time_str is None or time_str in s.schedule]
+        if repos is not None:
+            specs = [s for s in specs if s.full_name in repos]
+        if not specs:
+            return []
+
+        start = time.perf_counter()
+        results = list(self._pool.map(lambda spec: self._run_one(spec, action), specs))
+        elapsed = time.perf_counter() - start
+
+        succeeded = sum(1 for r in results if r["ok"])
+        rate = len(results) / elapsed * 60 if elapsed else float("inf")
+        print(f"📊 Fleet cycle: {succeeded}/{len(results)} repos succeeded in {elapsed:.1f}s "
+              f"({rate:.1f} repos/min, concurrency {self.concurrency})")
+        print(get_governor().summary())
+        cache = self.http_cache()
+        if cache and cache["hit_rate"] is not None:
+            print(f"🗄️  HTTP cache: {cache['hits']}/{cache['hits'] + cache['misses']} conditional GETs "
+                  f"served from cache ({cache['hit_rate']:.0%})")
+        for result in results:
+            if not result["ok"]:
+                print(f"   ❌ {result['repo']}: {result['error'] or 'commit failed'}")
+        return results
+
+    def commit_times(self):
+        return sorted({t for spec in self.specs for t in spec.schedule})
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def run_fleet(manifest_path, concurrency=None, once=False):
+    """Schedule every manifest repository in this process (or run one cycle with `once`)"""
+    from scheduler import AsyncScheduler
+
+    specs, settings = load_manifest(manifest_path)
+    runner = FleetRunner(specs, concurrency or settings.get("concurrency"), housekeeping=not once)
+    print(f"🚢 Loaded {len(specs)} repositories from {manifest_path}")
+
+    try:
+        if once:
+            runner.run_cycle(action=lambda bot: bot.create_commit())
+            return
+
+        scheduler = AsyncScheduler(max_concurrency=Config.SCHEDULER_CONCURRENCY)
+        for time_str in runner.commit_times():
+            scheduler.every_day_at(time_str, runner.run_cycle, time_str, name=f"fleet@{time_str}")
+
+        print("📅 Fleet scheduled! Cycles will run at:")
+        for time_str in runner.commit_times():
+            due = sum(1 for spec in specs if time_str in spec.schedule)
+            print(f"   - {time_str} ({due} repos)")
+        print(f"⏭️  Next cycle at {scheduler.next_fire_time():%Y-%m-%d %H:%M:%S}")
+
+        scheduler.run_forever()
+    finally:
+        runner.shutdown()
@@ -0,0 +1,170 @@
+"""
+Contribution content generators for GitHub Commit Bot
+Templates are parsed once into a format string plus the fields they use, so
+rendering an item only computes those fields. Generators turn (when, message)
+into a file path and content; render_batch() renders many items in one call.
+"""
+
+import json
+import os
+import random
+from functools import lru_cache
+from string import Formatter
+
+from config import Config
+from storage import ENTRY_SEPARATOR, create_layout
+
+DEFAULT_MARKDOWN_TEMPLATE = """# Daily Update - {timestamp}
+
+This is an automated commit to maintain GitHub contribution streak.
+
+## Details:
+- Date: {timestamp}
+- Random number: {random_number}
+- Commit type: Daily maintenance
+
+## Changes:
+- Updated contribution data
+- Maintained coding streak
+- Added progress tracking
+
+Generated by GitHub Commit Bot
+"""
+DEFAULT_CHANGELOG_TEMPLATE = "- {timestamp}: {message}\n"
+CHANGELOG_HEADER = "# Changelog\n\n"
+
+# Values a template can use; each is computed at most once per rendered item.
+# isoformat() is several times cheaper than strftime() and gives the same text.
+FIELDS = {
+    "timestamp": lambda when, message: when.isoformat(" ", "seconds"),
+    "date": lambda when, message: when.date().isoformat(),
+    "time": lambda when, message: when.time().isoformat("seconds"),
+    "random_number": lambda when, message: random.randint(1, 1000),
+    "message": lambda when, message: message,
+}
+
+
+class Template:
+    """A str.format template parsed once into a fill string and the fields it uses
+
+    Templates without format specs or conversions are compiled to a %-format
+    string, which Python fills faster than str.format.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        parsed = list(Formatter().parse(text))
+        fields = {}
+        for _, field, _, _ in parsed:
+            if field is None:
+                continue
+            if field not in FIELDS:
+                raise ValueError(f"Unknown template field: {{{field}}} (choose from {', '.join(FIELDS)})")
+            fields[field] = FIELDS[field]
+        self.fields = tuple(fields)
+        self._getters = tuple(fields.items())
+
+        chunks = []
+        if any(spec or conversion for _, _, spec, conversion in parsed):
+            for literal, field, spec, conversion in parsed:
+                chunks.append(literal.replace("{", "{{").replace("}", "}}"))
+                if field is not None:
+                    chunks.append("{" + field + (f"!{conversion}" if conversion else "")
+                                  + (f":{spec}" if spec else "") + "}")
+            self._fill = "".join(chunks).format_map
+        else:
+            for literal, field, _, _ in parsed:
+                chunks.append(literal.replace("%", "%%"))
+                if field is not None:
+                    chunks.append(f"%({field})s")
+            self._fill = "".join(chunks).__mod__
+
+    def render(self, when, message=None):
+        return self._fill({name: getter(when, message) for name, getter in self._getters})
+
+
+@lru_cache(maxsize=None)
+def compile_template(text):
+    """Compile `text` once per process; every bot of a fleet shares the result"""
+    return Template(text)
+
+
+@lru_cache(maxsize=None)
+def load_template(path):
+    """Read and compile a template file once per process"""
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    with open(path) as f:
+        return compile_template(f.read())
+
+
+class MarkdownGenerator:
+    """A markdown entry per contribution, placed by the contributions layout"""
+
+    name = "markdown"
+    extension = ".md"
+    separator = ENTRY_SEPARATOR
+    default_template = DEFAULT_MARKDOWN_TEMPLATE
+
+    def __init__(self, layout_name, root, template=None):
+        self.layout = create_layout(layout_name, root, extension=self.extension, separator=self.separator)
+        self.template = template or (self.default_template and compile_template(self.default_template))
+
+    def entry(self, when, message):
+        return self.template.render(when, message)
+
+    def render(self, when, message, read_existing):
+        return self.layout.render(when, self.entry(when, message), read_existing)
+
+    def render_batch(self, items, read_existing, pending):
+        """Render (when, message) items in order; later items see earlier ones through `pending`"""
+        rendered = []
+        for when, message in items:
+            path, content = self.render(when, message, read_existing)
+            pending[path] = content
+            rendered.append((path, content))
+        return rendered
+
+
+class JsonMetricsGenerator(MarkdownGenerator):
+    """One JSON object per contribution; the monthly layout collects them as JSON lines"""
+
+    name = "json"
+    extension = ".jsonl"
+    separator = ""  # every entry already ends with a newline
+    default_template = None  # fixed schema: CONTENT_TEMPLATE does not apply
+
+    def entry(self, when, message):
+        return json.dumps({
+            "timestamp": when.isoformat(timespec="seconds"),
+            "random_number": random.randint(1, 1000),
+            "message": message,
+        }, separators=(",", ":")) + "\n"
+
+
+class ChangelogGenerator(MarkdownGenerator):
+    """Append a line per contribution to a single changelog file"""
+
+    name = "changelog"
+    default_template = DEFAULT_CHANGELOG_TEMPLATE
+
+    def __init__(self, layout_name, root, template=None, path=None):
+        super().__init__(layout_name, root, template)
+        self.path = path or Config.CHANGELOG_PATH
+
+    def render(self, when, message, read_existing):
+        existing = read_existing(self.path) or CHANGELOG_HEADER
+        return self.path, existing + self.entry(when, message)
+
+
+GENERATORS = {generator.name: generator for generator in (MarkdownGenerator, JsonMetricsGenerator, ChangelogGenerator)}
+
+
+def create_generator(name, layout_name, root, template_path=None):
+    generator_class = GENERATORS.get(name)
+    if generator_class is None:
+        raise ValueError(f"Unknown content generator: {name} (choose from {', '.join(GENERATORS)})")
+    if template_path and generator_class.default_template is None:
+        raise ValueError(f"The {name} content generator does not use CONTENT_TEMPLATE; unset it or pick "
+                         f"one of: {', '.join(n for n, g in GENERATORS.items() if g.default_template)}")
+    return generator_class(layout_name, root, load_template(template_path) if template_path else None)
@@ -0,0 +1,218 @@
+"""
+Shared GitHub client for GitHub Commit Bot
+One pooled, retrying HTTP session per process, with an on-disk ETag /
+Last-Modified cache so unchanged GET requests come back as 304s.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from config import Config
+from governor import get_governor
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class ConditionalCache:
+    """SQLite store of cacheable GET responses keyed by URL and credentials
+
+    `stored_at` is refreshed whenever a response is served from the cache, so
+    pruning on put() drops entries unused for `max_age` seconds and then the
+    least recently used ones beyond `max_entries`.
+    """
+
+    def __init__(self, path, max_age=None, max_entries=None):
+        self.max_age = Config.HTTP_CACHE_MAX_AGE_DAYS * 86400 if max_age is None else max_age
+        self.max_entries = Config.HTTP_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT, body TEXT, stored_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url, headers):
+        vary = "\n".join([url, headers.get("Authorization", ""), headers.get("Accept", "")])
+        return hashlib.sha256(vary.encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body = row
+        return {"etag": etag, "last_modified": last_modified, "headers": json.loads(headers), "body": body}
+
+    def touch(self, key):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def put(self, key, etag, last_modified, headers, body):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(dict(headers)), body, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (now - self.max_age,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+def _is_later_page(url):
+    page = parse_qs(urlparse(url).query).get("page")
+    return bool(page) and page[0] != "1"
+
+
+class CachedResponse:
+    # mimics the httplib-style response PyGithub reads from its connection
+    def __init__(self, status, headers, text):
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self.text
+
+
+class PooledConnection:
+    """Thread-safe stand-in for PyGithub's connection object
+
+    PyGithub 1.59 keeps one connection per client and stores each request on
+    it between request() and getresponse(), which races when threads share a
+    client. Here the pending request lives in thread-local storage and every
+    thread shares one requests.Session connection pool. Every request first
+    takes a slot from the rate-limit governor and reports its headers back.
+    """
+
+    def __init__(self, base_url, session, timeout, verify=True, cache=None, governor=None):
+        parsed = urlparse(base_url)
+        default_port = 443 if parsed.scheme == "https" else 80
+        self.origin = f"{parsed.scheme}://{parsed.hostname}:{parsed.port or default_port}"
+        self.session = session
+        self.timeout = timeout
+        self.verify = verify
+        self.cache = cache
+        self.governor = governor
+        self._local = threading.local()
+
+    def request(self, verb, url, input, headers):
+        self._local.pending = (verb, url, input, dict(headers))
+
+    def getresponse(self):
+        verb, url, body, headers = self._local.pending
+        cache_key = entry = None
+        if self.cache is not None and verb == "GET":
+            cache_key = ConditionalCache.key(url, headers)
+            entry = self.cache.get(cache_key)
+            if entry and entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            elif entry and entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        for attempt in range(Config.GOVERNOR_RETRIES + 1):
+            if self.governor:
+                self.governor.acquire()
+            r = self.session.request(
+                verb, self.origin + url, headers=headers, data=body,
+                timeout=self.timeout, verify=self.verify, allow_redirects=False,
+            )
+            if not self.governor or not self.governor.observe(r.status_code, r.headers, r.text):
+                break
+            print(f"⏳ GitHub rate limit hit on {verb} {url}, backing off (attempt {attempt + 1})")
+
+        if r.status_code == 304 and entry:
+            self.cache.hits += 1
+            self.cache.touch(cache_key)
+            # Serve the cached body, but with fresh rate-limit headers
+            merged = dict(entry["headers"])
+            merged.update(r.headers)
+            return CachedResponse(200, merged, entry["body"])
+
+        if cache_key:
+            self.cache.misses += 1
+            etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+            # Later pages of a listing (history walks) are read once and never revalidated
+            if r.status_code == 200 and (etag or last_modified) and not _is_later_page(url):
+                self.cache.put(cache_key, etag, last_modified, r.headers, r.text)
+        return CachedResponse(r.status_code, r.headers, r.text)
+
+    def close(self):
+        return
+
+
+def build_session(pool_size=None, retries=None, backoff=None):
+    """A keep-alive requests session with pooled connections and retry/backoff"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=Config.HTTP_RETRIES if retries is None else retries,
+        backoff_factor=Config.HTTP_BACKOFF if backoff is None else backoff,
+        status_forcelist=(500, 502, 503, 504),
+        respect_retry_after_header=True,
+    )
+    pool_size = pool_size or Config.HTTP_POOL_SIZE
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_github(token=None, base_url=None, pool_size=None):
+    """Return the process-wide Github client for this token and API URL"""
+    token = token or Config.GITHUB_TOKEN
+    base_url = base_url or Config.GITHUB_API_URL
+    key = (token, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _create_client(token, base_url, pool_size)
+            _clients[key] = client
+    return client
+
+
+def _create_client(token, base_url, pool_size):
+    from github import Github
+
+    client = Github(token, base_url=base_url, timeout=Config.HTTP_TIMEOUT)
+    cache = None
+    if Config.HTTP_CACHE_PATH:
+        path = Config.HTTP_CACHE_PATH
+        if path != ":memory:":
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        cache = ConditionalCache(path)
+    connection = PooledConnection(
+        base_url, build_session(pool_size), Config.HTTP_TIMEOUT, cache=cache, governor=get_governor()
+    )
+    # PyGithub reuses the requester's persistent connection; install ours in its place
+    client._Github__requester._Requester__connection = connection
+    return client
+
+
+def cache_stats(client):
+    """Return (hits, misses) of the conditional cache behind `client`"""
+    connection = client._Github__requester._Requester__connection
+    cache = getattr(connection, "cache", None)
+    return (cache.hits, cache.misses) if cache else (0, 0)
@@ -0,0 +1,211 @@
+"""
+Rate-limit governor for GitHub Commit Bot
+Paces every API request in the process against the live GitHub quota,
+keeps headroom for high-priority calls and backs off on secondary limits.
+State can optionally be shared between processes through a lock file.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; fall back to per-process state
+    fcntl = None
+
+# Fraction of the hourly limit each priority must leave untouched
+PRIORITY_RESERVE = {"high": 0.0, "normal": 0.05, "low": 0.2}
+
+_local = threading.local()
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than GOVERNOR_MAX_WAIT"""
+
+
+@contextmanager
+def request_priority(priority):
+    """Run API calls inside the block at `priority` ("high", "normal" or "low")"""
+    if priority not in PRIORITY_RESERVE:
+        raise ValueError(f"Unknown request priority: {priority}")
+    previous = getattr(_local, "priority", "normal")
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def current_priority():
+    return getattr(_local, "priority", "normal")
+
+
+class RateGovernor:
+    """Token bucket fed by X-RateLimit-* headers
+
+    Above `pace_below` of the limit requests pass straight through. Below it
+    they are spread evenly over the time left until the quota resets.
+    """
+
+    def __init__(self, burst=10, pace_below=0.5, max_wait=300, state_path=None, clock=time.time,
+                 sleep=time.sleep):
+        self.burst = burst
+        self.pace_below = pace_below
+        self.max_wait = max_wait
+        self.state_path = state_path if fcntl else None
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._state = {"limit": None, "remaining": None, "reset": None, "blocked_until": 0.0,
+                       "tokens": float(burst), "updated": clock()}
+        self.requests = 0
+        self.throttled = 0
+        self.waits = 0
+        self.wait_seconds = {priority: 0.0 for priority in PRIORITY_RESERVE}
+
+    @contextmanager
+    def _shared_state(self):
+        with self._lock:
+            if not self.state_path:
+                yield self._state
+                return
+            with open(self.state_path, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    text = f.read()
+                    if text:
+                        self._state.update(json.loads(text))
+                    yield self._state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(self._state))
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _delay(self, state, priority, now):
+        """Seconds to wait before a `priority` request may go out (0 takes a token)"""
+        if state["blocked_until"] > now:
+            return state["blocked_until"] - now
+        remaining, limit, reset = state["remaining"], state["limit"], state["reset"]
+        if remaining is None or not limit:
+            return 0.0
+        if reset is not None and now >= reset:
+            # The window rolled over: nothing else would refresh the headers if the last ones said 0
+            state["remaining"], state["reset"] = remaining, reset = limit, None
+
+        floor = limit * PRIORITY_RESERVE[priority]
+        time_left = max((reset or now) - now, 1.0)
+        if remaining <= floor:
+            return time_left
+        if remaining > limit * self.pace_below:
+            state["remaining"] = remaining - 1
+            return 0.0
+
+        rate = (remaining - floor) / time_left
+        tokens = min(self.burst, state["tokens"] + max(now - state["updated"], 0) * rate)
+        state["updated"] = now
+        if tokens >= 1:
+            state["tokens"] = tokens - 1
+            state["remaining"] = remaining - 1
+            return 0.0
+        state["tokens"] = tokens
+        return (1 - tokens) / rate
+
+    def acquire(self, priority=None):
+        """Block until a request at `priority` fits the budget; returns seconds waited"""
+        priority = priority or current_priority()
+        waited = 0.0
+        while True:
+            with self._shared_state() as state:
+                delay = self._delay(state, priority, self.clock())
+            if delay <= 0:
+                break
+            if waited + delay > self.max_wait:
+                raise RateLimitExceeded(
+                    f"GitHub API budget exhausted for {priority} requests (next slot in {delay:.0f}s)"
+                )
+            self.sleep(delay)
+            waited += delay
+        self.requests += 1
+        if waited:
+            self.waits += 1
+            self.wait_seconds[priority] += waited
+        return waited
+
+    def observe(self, status, headers, body=""):
+        """Feed a response back in; returns True when it was rate limited and may be retried"""
+        headers = {k.lower(): v for k, v in headers.items()}
+        now = self.clock()
+        limited = False
+        with self._shared_state() as state:
+            if "x-ratelimit-remaining" in headers:
+                state["remaining"] = int(headers["x-ratelimit-remaining"])
+                state["limit"] = int(headers.get("x-ratelimit-limit", state["limit"] or 0)) or None
+                state["reset"] = float(headers.get("x-ratelimit-reset", state["reset"] or now))
+
+            if status in (403, 429):
+                retry_after = headers.get("retry-after")
+                if retry_after:
+                    state["blocked_until"] = now + float(retry_after)
+                    limited = True
+                elif state["remaining"] == 0:
+                    state["blocked_until"] = state["reset"] or now + 60
+                    limited = True
+                elif "secondary rate limit" in (body or "").lower():
+                    state["blocked_until"] = now + 60
+                    limited = True
+        if limited:
+            self.throttled += 1
+        return limited
+
+    def metrics(self):
+        state = self._state
+        now = self.clock()
+        headroom = None
+        if state["limit"] and state["remaining"] is not None:
+            headroom = state["remaining"] / state["limit"]
+        return {
+            "limit": state["limit"],
+            "remaining": state["remaining"],
+            "headroom": headroom,
+            "reset_in_seconds": max((state["reset"] or now) - now, 0),
+            "blocked_for_seconds": max(state["blocked_until"] - now, 0),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waits": self.waits,
+            "wait_seconds": dict(self.wait_seconds),
+        }
+
+    def summary(self):
+        m = self.metrics()
+        headroom = f"{m['headroom']:.0%}" if m["headroom"] is not None else "unknown"
+        waited = sum(m["wait_seconds"].values())
+        return (f"🛡️  API headroom {headroom} ({m['remaining']}/{m['limit']}), "
+                f"{m['requests']} requests, {m['throttled']} throttled, waited {waited:.1f}s")
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor():
+    """Return the process-wide governor configured from Config"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            state_path = Config.GOVERNOR_STATE_PATH or None
+            if state_path:
+                state_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), state_path)
+            _governor = RateGovernor(
+                burst=Config.GOVERNOR_BURST,
+                pace_below=Config.GOVERNOR_PACE_BELOW,
+                max_wait=Config.GOVERNOR_MAX_WAIT,
+                state_path=state_path,
+            )
+        return _governor
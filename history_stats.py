@@ -0,0 +1,189 @@
+"""
+Commit history statistics for GitHub Commit Bot
+Streams a branch's history (from the local clone or the GitHub API) and keeps
+only a per-day histogram, so memory grows with the number of active days, not
+the number of commits. The histogram is cached in the ledger together with the
+last-seen head, so later runs only walk the commits added since.
+"""
+
+import subprocess
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+HISTOGRAM_DAYS = 14
+API_PAGE_SIZE = 100
+
+
+def _local_day(timestamp):
+    return datetime.fromtimestamp(timestamp).date()
+
+
+def _git_log(repo_dir, revisions):
+    process = subprocess.Popen(
+        ["git", "log", "--format=%H %at", *revisions, "--"],
+        cwd=repo_dir, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        for line in process.stdout:
+            sha, timestamp = line.split()
+            yield sha, int(timestamp)
+    finally:
+        # The caller may stop early once it reaches the cached head
+        process.stdout.close()
+        process.kill()
+        process.wait()
+
+
+def has_local_ref(repo_dir, ref):
+    return subprocess.run(["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+                          cwd=repo_dir, capture_output=True).returncode == 0
+
+
+def iter_local_history(repo_dir, ref, since=None):
+    """Yield (sha, author timestamp) for `ref`, newest first, straight from `git log`
+
+    When `since` is an ancestor of `ref` only `since..ref` is walked (merged-in
+    side branches included), followed by `since` itself as the boundary that
+    update_history() stops at.
+    """
+    if since and subprocess.run(["git", "merge-base", "--is-ancestor", since, ref],
+                                cwd=repo_dir, capture_output=True).returncode == 0:
+        yield from _git_log(repo_dir, [f"{since}..{ref}"])
+        yield since, None
+    else:
+        yield from _git_log(repo_dir, [ref])
+
+
+def iter_remote_history(repo, branch, page_size=API_PAGE_SIZE):
+    """Yield (sha, author timestamp) for `branch` from the API one page at a time, newest first
+
+    Pages are fetched lazily, so no more requests are made once the caller
+    stops iterating. Only the raw JSON is read; no Commit objects are built.
+    """
+    from github import GithubException
+
+    page = 1
+    while True:
+        try:
+            _, data = repo._requester.requestJsonAndCheck(
+                "GET", f"{repo.url}/commits", parameters={"sha": branch, "per_page": page_size, "page": page}
+            )
+        except GithubException as e:
+            if e.status == 409:  # empty repository
+                return
+            raise
+        for item in data:
+            author_date = datetime.strptime(item["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ")
+            yield item["sha"], int(author_date.replace(tzinfo=timezone.utc).timestamp())
+        if len(data) < page_size:
+            return
+        page += 1
+
+
+def remote_commit_count(repo, branch=None):
+    """Number of commits on `branch` in one request (GitHub reports the page count with per_page=1)"""
+    from github import GithubException
+
+    try:
+        commits = repo.get_commits(sha=branch) if branch else repo.get_commits()
+        return commits.totalCount
+    except GithubException as e:
+        if e.status == 409:  # empty repository
+            return 0
+        raise
+
+
+def update_history(ledger, branch, walk):
+    """Fold the commits newer than the cached head into the ledger histogram
+
+    `walk(since)` returns a newest-first stream of (sha, timestamp), e.g.
+    iter_local_history or iter_remote_history with the cached head as `since`.
+    It is consumed until the cached head shows up. If it never does the branch
+    was rewritten and the histogram is rebuilt from the full stream. Returns
+    the number of commits processed.
+    """
+    cached = ledger.history_head(branch)
+    cached_sha = cached[0] if cached else None
+    head = None
+    days = Counter()
+    processed = 0
+    reached_cache = False
+    for sha, timestamp in walk(cached_sha):
+        if sha == cached_sha:
+            reached_cache = True
+            break
+        if head is None:
+            head = sha
+        days[_local_day(timestamp)] += 1
+        processed += 1
+    if head is not None:
+        ledger.add_history(branch, head, processed, days, reset=not reached_cache)
+    elif not reached_cache and cached:
+        ledger.add_history(branch, cached_sha, 0, {}, reset=True)  # branch is now empty
+    return processed
+
+
+def streaks(days, today=None):
+    """Return (current, longest) runs of consecutive active days from an oldest-first (date, commits) stream
+
+    The current streak still counts if the last commit was yesterday; today is not over yet.
+    """
+    today = today or date.today()
+    longest = run = 0
+    previous = None
+    for day, _ in days:
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    current = run if previous is not None and today - previous <= timedelta(days=1) else 0
+    return current, longest
+
+
+def summarize(ledger, branch, histogram_days=HISTOGRAM_DAYS, today=None):
+    """Build the stats report from the cached histogram"""
+    today = today or date.today()
+    cached = ledger.history_head(branch)
+    window_start = today - timedelta(days=histogram_days - 1)
+    recent = Counter()
+    active = 0
+    first = last = None
+
+    def tally():
+        nonlocal active, first, last
+        for day, commits in ledger.history_days(branch):
+            active += 1
+            first = first or day
+            last = day
+            if day >= window_start:
+                recent[day] = commits
+            yield day, commits
+
+    current, longest = streaks(tally(), today)
+    return {
+        "branch": branch,
+        "head": cached[0] if cached else None,
+        "total_commits": cached[1] if cached else 0,
+        "active_days": active,
+        "first_day": first.isoformat() if first else None,
+        "last_day": last.isoformat() if last else None,
+        "current_streak": current,
+        "longest_streak": longest,
+        "recent_days": {day.isoformat(): recent[day]
+                        for day in (window_start + timedelta(days=i) for i in range(histogram_days))},
+    }
+
+
+def print_stats(stats, processed=None):
+    print(f"📊 History of {stats['branch']}: {stats['total_commits']} commits on {stats['active_days']} days")
+    if stats["first_day"]:
+        print(f"   First commit day: {stats['first_day']}, last: {stats['last_day']}")
+    print(f"🔥 Current streak: {stats['current_streak']} days (longest: {stats['longest_streak']} days)")
+    if processed is not None:
+        print(f"🧮 Processed {processed} new commits since the last run")
+    recent = stats["recent_days"]
+    if recent:
+        scale = max(1, max(recent.values()))
+        print(f"📅 Last {len(recent)} days:")
+        for day, commits in recent.items():
+            bar = "█" * round(commits * 20 / scale) if commits else ""
+            print(f"   {day} {commits:>4} {bar}")
@@ -0,0 +1,252 @@
+"""
+Git housekeeping for GitHub Commit Bot
+The bot adds commits to the same clone forever, and loose objects and small
+packs pile up until every git command (and git's own blocking `gc --auto`)
+slows down. A Housekeeper thread per clone wakes in the idle windows between
+the commit times, repacks loose objects, rolls small packs together, writes
+the commit-graph and multi-pack-index, prunes old garbage once a day, and logs
+what each pass gained. It never takes the commit lock: tasks only start while
+the next commit is further away than HOUSEKEEPING_MARGIN.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from config import Config
+from git_backend import _run_git
+from scheduler import MAX_SLEEP, parse_time
+from tracing import phase
+
+PRUNE_INTERVAL = 24 * 3600
+# One pass at a time per process, so a fleet does not repack every clone at once
+_PASS_LOCK = threading.Lock()
+
+
+def _git(args, repo_dir):
+    result = _run_git(args, repo_dir)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip() or result.stdout.strip()}")
+    return result.stdout
+
+
+def objects_dir(repo_dir):
+    path = _git(["rev-parse", "--git-common-dir"], repo_dir).strip()
+    return os.path.join(repo_dir, path, "objects")
+
+
+def object_stats(repo_dir, objects=None):
+    """Loose-object and pack counts of a clone, from `git count-objects -v`"""
+    values = dict(line.split(": ", 1) for line in _git(["count-objects", "-v"], repo_dir).splitlines())
+    objects = objects or objects_dir(repo_dir)
+    info = os.path.join(objects, "info")
+    return {
+        "loose": int(values["count"]),
+        "loose_kib": int(values["size"]),
+        "packs": int(values["packs"]),
+        "pack_kib": int(values["size-pack"]),
+        "garbage": int(values["garbage"]),
+        "commit_graph": os.path.exists(os.path.join(info, "commit-graph"))
+                        or os.path.isdir(os.path.join(info, "commit-graphs")),
+        "midx": os.path.exists(os.path.join(objects, "pack", "multi-pack-index")),
+        "midx_stale": _midx_stale(os.path.join(objects, "pack")),
+    }
+
+
+def _midx_stale(pack_dir):
+    try:
+        entries = os.listdir(pack_dir)
+    except FileNotFoundError:
+        return False
+    packs = [os.path.getmtime(os.path.join(pack_dir, e)) for e in entries if e.endswith(".pack")]
+    if len(packs) < 2:
+        return False
+    if "multi-pack-index" not in entries:
+        return True
+    return max(packs) > os.path.getmtime(os.path.join(pack_dir, "multi-pack-index"))
+
+
+def _kib(value):
+    return f"{value / 1024:.1f} MiB" if value >= 1024 else f"{value} KiB"
+
+
+def describe_gain(before, after):
+    """One line comparing two object_stats snapshots"""
+    size_before = before["loose_kib"] + before["pack_kib"]
+    size_after = after["loose_kib"] + after["pack_kib"]
+    return (f"loose objects {before['loose']}→{after['loose']}, packs {before['packs']}→{after['packs']}, "
+            f"{_kib(size_before)}→{_kib(size_after)}")
+
+
+class Housekeeper:
+    """Maintenance passes for one clone, run in the gaps between its commit times"""
+
+    def __init__(self, repo_dir, name=None, loose_limit=None, pack_limit=None, min_idle=None,
+                 margin=None, prune_expire=None, clock=datetime.now):
+        self.repo_dir = repo_dir
+        self.name = name or os.path.basename(repo_dir)
+        self.loose_limit = Config.HOUSEKEEPING_LOOSE_OBJECTS if loose_limit is None else loose_limit
+        self.pack_limit = Config.HOUSEKEEPING_MAX_PACKS if pack_limit is None else pack_limit
+        self.min_idle = Config.HOUSEKEEPING_MIN_IDLE if min_idle is None else min_idle
+        self.margin = Config.HOUSEKEEPING_MARGIN if margin is None else margin
+        self.prune_expire = prune_expire or Config.HOUSEKEEPING_PRUNE_EXPIRE
+        self.clock = clock
+        self.commit_times = []
+        self.last_pass = None
+        self._objects = None
+        self._partial = None
+        self._graph_head = None
+        self._last_prune = None
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+    # -- tasks ---------------------------------------------------------------
+
+    @property
+    def partial_clone(self):
+        """True for a blobless clone (see bootstrap.py) that fetches missing objects on demand"""
+        if self._partial is None:
+            promisors = _run_git(["config", "--get-regexp", r"^remote\..*\.promisor$"], self.repo_dir).stdout
+            self._partial = "true" in promisors.split()
+        return self._partial
+
+    def stats(self):
+        if self._objects is None:
+            self._objects = objects_dir(self.repo_dir)
+        return object_stats(self.repo_dir, self._objects)
+
+    def due_tasks(self, stats):
+        """Names of the tasks worth running for these object counts, cheapest first"""
+        tasks = []
+        if stats["loose"] >= self.loose_limit:
+            tasks.append("loose-objects")
+        if stats["packs"] >= self.pack_limit:
+            tasks.append("incremental-repack")
+        head = _run_git(["rev-parse", "-q", "--verify", "HEAD"], self.repo_dir).stdout.strip()
+        if head and (not stats["commit_graph"] or head != self._graph_head):
+            tasks.append("commit-graph")
+        if "incremental-repack" not in tasks and (stats["midx_stale"] or "loose-objects" in tasks
+                                                  and stats["packs"]):
+            # The geometric repack writes the index itself; otherwise refresh it when packs changed
+            tasks.append("multi-pack-index")
+        if "loose-objects" in tasks and (self._last_prune is None
+                                         or time.time() - self._last_prune >= PRUNE_INTERVAL):
+            tasks.append("prune")
+        return tasks
+
+    def _run_task(self, task):
+        if task == "loose-objects":
+            # Packs reachable loose objects into one new pack and drops the packed loose copies
+            _git(["repack", "-d", "-q"], self.repo_dir)
+        elif task == "incremental-repack":
+            if self.partial_clone:
+                # Geometric repacks cannot handle promisor packs; a partial clone is small enough to repack whole
+                _git(["repack", "-a", "-d", "-q", "--write-midx"], self.repo_dir)
+            else:
+                # Merges the small packs into a geometric progression, leaving the big ones alone
+                _git(["repack", "-d", "-q", "--geometric=2", "--write-midx"], self.repo_dir)
+        elif task == "commit-graph":
+            # Incremental: only commits added since the last write go into a new layer
+            _git(["commit-graph", "write", "--reachable", "--split", "--no-progress"], self.repo_dir)
+            self._graph_head = _run_git(["rev-parse", "HEAD"], self.repo_dir).stdout.strip()
+        elif task == "multi-pack-index":
+            _git(["multi-pack-index", "write", "--no-progress"], self.repo_dir)
+        elif task == "prune":
+            _git(["prune", f"--expire={self.prune_expire}"], self.repo_dir)
+            self._last_prune = time.time()
+
+    def run_pass(self, deadline=None, force=False):
+        """Run the due tasks (all of them with `force`) until `deadline`
+
+        Returns a summary dict, or None when there was nothing to do or
+        another clone's pass held the slot until the deadline.
+        """
+        if deadline is not None and self.clock() >= deadline:
+            return None
+        wait = -1 if deadline is None else max((deadline - self.clock()).total_seconds(), 0)
+        if not _PASS_LOCK.acquire(timeout=wait):
+            return None
+        try:
+            before = self.stats()
+            tasks = self.due_tasks(before)
+            if force:
+                tasks = ["loose-objects", "incremental-repack", "commit-graph", "multi-pack-index", "prune"]
+            if not tasks:
+                return None
+            start = time.perf_counter()
+            done = []
+            with phase("maintenance"):
+                for task in tasks:
+                    if deadline is not None and self.clock() >= deadline:
+                        print(f"⏭️  Housekeeping {self.name}: stopping before {task}, a commit is due soon")
+                        break
+                    try:
+                        self._run_task(task)
+                        done.append(task)
+                    except Exception as e:
+                        print(f"⚠️  Housekeeping {self.name}: {task} failed ({e})")
+            after = self.stats()
+        finally:
+            _PASS_LOCK.release()
+
+        seconds = time.perf_counter() - start
+        self.last_pass = {"at": datetime.now().isoformat(timespec="seconds"), "tasks": done,
+                          "seconds": round(seconds, 3), "before": before, "after": after}
+        print(f"🧹 Housekeeping {self.name}: {', '.join(done) or 'nothing'} in {seconds:.1f}s - "
+              f"{describe_gain(before, after)}")
+        return self.last_pass
+
+    # -- idle windows --------------------------------------------------------
+
+    def next_window(self, now):
+        """(start, end) of the next idle window at or after `now`, or None
+
+        A window runs from `margin` after one commit time to `margin` before
+        the next, and counts only if it is at least `min_idle` seconds long.
+        """
+        if not self.commit_times:
+            return None
+        times = sorted({parse_time(t) for t in self.commit_times})
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        fires = [midnight + timedelta(days=day, hours=h, minutes=m, seconds=s)
+                 for day in (-1, 0, 1) for h, m, s in times]
+        fires.append(fires[len(times)] + timedelta(days=2))
+        margin = timedelta(seconds=self.margin)
+        for fire, next_fire in zip(fires, fires[1:]):
+            start, end = fire + margin, next_fire - margin
+            if (end - start).total_seconds() >= self.min_idle and end > now:
+                return max(start, now), end
+        return None
+
+    def start(self, commit_times):
+        """Run passes in the idle windows between `commit_times` from a daemon thread"""
+        self.commit_times = list(commit_times)
+        if self._thread is not None or self._stopped:
+            return
+        self._thread = threading.Thread(target=self._run, name=f"housekeeping-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _run(self):
+        resume_at = None
+        while not self._stopped:
+            now = self.clock()
+            window = self.next_window(max(now, resume_at) if resume_at else now)
+            if window is None:
+                return
+            start, end = window
+            if start > now:
+                # Short sleeps so wall-clock jumps move the window too
+                self._wake.wait(min((start - now).total_seconds(), MAX_SLEEP))
+                continue
+            try:
+                self.run_pass(deadline=end)
+            except Exception as e:
+                print(f"⚠️  Housekeeping {self.name} failed: {e}")
+            # One pass per window; the next commit is what adds new work
+            resume_at = end
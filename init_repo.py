@@ -4,6 +4,7 @@ Initialize the Gitgremlin repository with the first commit
 This script helps set up the repository for the commit bot
 """
 
+import argparse
 import os
 import subprocess
 import sys
@@ -86,5 +87,25 @@ This repository is managed by an automated commit bot that creates daily contrib
     
     return True
 
+def bootstrap_existing_repository():
+    """Attach to a repository that already has history instead of starting a new one"""
+    from bootstrap import bootstrap_repository
+    
+    print("🚀 Bootstrapping from the existing Gitgremlin repository...")
+    print("=" * 50)
+    if not bootstrap_repository("https://github.com/nikhil-shr-23/Gitgremlin.git", ".", "main"):
+        return False
+    
+    print("\n" + "=" * 50)
+    print("🎉 Repository bootstrap completed!")
+    print("💡 Run: python commit_bot.py --test (to create the next bot commit)")
+    return True
+
 if __name__ == "__main__":
-    initialize_repository()
+    parser = argparse.ArgumentParser(description="Initialize the Gitgremlin repository")
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="the GitHub repository already has commits: shallow, sparse clone it instead")
+    if parser.parse_args().bootstrap:
+        bootstrap_existing_repository()
+    else:
+        initialize_repository()
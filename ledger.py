@@ -0,0 +1,309 @@
+"""
+Local commit ledger for GitHub Commit Bot
+Records every commit the bot makes so the daily skip check can be answered
+without a network round-trip.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    committed_at TEXT NOT NULL,
+    pushed INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    path TEXT
+);
+CREATE INDEX IF NOT EXISTS commits_by_day ON commits (repo, branch, committed_at);
+CREATE TABLE IF NOT EXISTS remote_heads (
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    sha TEXT,
+    committed_at TEXT,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (repo, branch)
+);
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    first_at TEXT NOT NULL,
+    step_seconds REAL NOT NULL,
+    finished INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS batch_items (
+    batch_id INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    sha TEXT NOT NULL,
+    PRIMARY KEY (batch_id, idx)
+);
+CREATE TABLE IF NOT EXISTS remote_trees (
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    tree_sha TEXT NOT NULL,
+    PRIMARY KEY (repo, branch)
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    PRIMARY KEY (repo, branch)
+);
+CREATE TABLE IF NOT EXISTS history_heads (
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (repo, branch)
+);
+CREATE TABLE IF NOT EXISTS history_days (
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    day TEXT NOT NULL,
+    commits INTEGER NOT NULL,
+    PRIMARY KEY (repo, branch, day)
+);
+"""
+
+
+class CommitLedger:
+    """SQLite-backed record of bot commits and the last known remote head"""
+
+    def __init__(self, path, repo, clock=time.time):
+        self.path = path
+        self.repo = repo
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, sha, committed_at, branch, pushed=False, message=None, path=None):
+        """Insert or update a commit produced by the bot"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO commits (sha, repo, branch, committed_at, pushed, message, path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sha, self.repo, branch, committed_at.strftime(TIMESTAMP_FORMAT), int(pushed), message, path),
+            )
+
+    def mark_pushed(self, shas):
+        """Flag the given commits as present on the remote"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE commits SET pushed = 1 WHERE sha = ? AND repo = ?",
+                [(sha, self.repo) for sha in shas],
+            )
+
+    def rewrite_commits(self, mapping):
+        """Follow commits to their new SHAs after a rebase ({old: new})"""
+        with self._lock, self._conn:
+            pairs = [(new, old, self.repo) for old, new in mapping.items()]
+            self._conn.executemany("UPDATE OR REPLACE commits SET sha = ? WHERE sha = ? AND repo = ?", pairs)
+            self._conn.executemany(
+                "UPDATE batch_items SET sha = ? WHERE sha = ? AND batch_id IN "
+                "(SELECT batch_id FROM batches WHERE repo = ?)", pairs,
+            )
+
+    def has_pushed_commit_on(self, day, branch):
+        """True if a pushed bot commit on `branch` is dated `day`"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM commits WHERE repo = ? AND branch = ? AND pushed = 1 "
+                "AND date(committed_at) = ? LIMIT 1",
+                (self.repo, branch, day.isoformat()),
+            ).fetchone()
+        return row is not None
+
+    def has_commit_on(self, day, branch):
+        """True if any bot commit on `branch`, pushed or still queued, is dated `day`"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM commits WHERE repo = ? AND branch = ? AND date(committed_at) = ? LIMIT 1",
+                (self.repo, branch, day.isoformat()),
+            ).fetchone()
+        return row is not None
+
+    def unpushed_count(self, branch):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM commits WHERE repo = ? AND branch = ? AND pushed = 0",
+                (self.repo, branch),
+            ).fetchone()[0]
+
+    def unpushed(self, branch):
+        """Return (sha, committed_at) for local-only commits, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sha, committed_at FROM commits WHERE repo = ? AND branch = ? AND pushed = 0 "
+                "ORDER BY committed_at",
+                (self.repo, branch),
+            ).fetchall()
+        return [(sha, datetime.strptime(ts, TIMESTAMP_FORMAT)) for sha, ts in rows]
+
+    def remote_head(self, branch, ttl):
+        """Return (sha, committed_at) of the cached remote head if younger than `ttl` seconds
+
+        Returns None on a cache miss. An empty remote is cached as (None, None).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha, committed_at, checked_at FROM remote_heads WHERE repo = ? AND branch = ?",
+                (self.repo, branch),
+            ).fetchone()
+        if row is None or self.clock() - row[2] > ttl:
+            return None
+        sha, ts, _ = row
+        return sha, datetime.strptime(ts, TIMESTAMP_FORMAT) if ts else None
+
+    def reconcile(self, branch, sha, committed_at):
+        """Store the remote head observed from the API and mark it pushed if it is ours"""
+        ts = committed_at.strftime(TIMESTAMP_FORMAT) if committed_at else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO remote_heads (repo, branch, sha, committed_at, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.repo, branch, sha, ts, self.clock()),
+            )
+            if sha:
+                self._conn.execute(
+                    "UPDATE commits SET pushed = 1 WHERE sha = ? AND repo = ?", (sha, self.repo)
+                )
+
+    def open_batch(self, branch, total):
+        """Return (batch_id, first_at, step) of an unfinished batch of `total` commits, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT batch_id, first_at, step_seconds FROM batches WHERE repo = ? AND branch = ? "
+                "AND total = ? AND finished = 0 ORDER BY batch_id DESC LIMIT 1",
+                (self.repo, branch, total),
+            ).fetchone()
+        if row is None:
+            return None
+        batch_id, first_at, step = row
+        return batch_id, datetime.strptime(first_at, TIMESTAMP_FORMAT), timedelta(seconds=step)
+
+    def start_batch(self, branch, total, first_at, step):
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO batches (repo, branch, total, first_at, step_seconds) VALUES (?, ?, ?, ?, ?)",
+                (self.repo, branch, total, first_at.strftime(TIMESTAMP_FORMAT), step.total_seconds()),
+            )
+        return cursor.lastrowid, first_at.replace(microsecond=0), step
+
+    def batch_items(self, batch_id):
+        """Return {index: sha} for the batch commits created so far"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, sha FROM batch_items WHERE batch_id = ?", (batch_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def record_batch_item(self, batch_id, index, sha):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO batch_items (batch_id, idx, sha) VALUES (?, ?, ?)",
+                (batch_id, index, sha),
+            )
+
+    def finish_batch(self, batch_id):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE batches SET finished = 1 WHERE batch_id = ?", (batch_id,))
+
+    def remote_tree(self, branch):
+        """Return the cached (commit_sha, tree_sha) of the remote branch head, or None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT commit_sha, tree_sha FROM remote_trees WHERE repo = ? AND branch = ?",
+                (self.repo, branch),
+            ).fetchone()
+
+    def set_remote_tree(self, branch, commit_sha, tree_sha):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO remote_trees (repo, branch, commit_sha, tree_sha) VALUES (?, ?, ?, ?)",
+                (self.repo, branch, commit_sha, tree_sha),
+            )
+
+    def clear_remote_tree(self, branch):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM remote_trees WHERE repo = ? AND branch = ?", (self.repo, branch)
+            )
+
+    def outbox_state(self, branch):
+        """Return (attempts, next_attempt_at, last_error) of the failed-push retry state, or None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT attempts, next_attempt_at, last_error FROM outbox WHERE repo = ? AND branch = ?",
+                (self.repo, branch),
+            ).fetchone()
+
+    def schedule_push_retry(self, branch, attempts, next_attempt_at, error):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO outbox (repo, branch, attempts, next_attempt_at, last_error) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.repo, branch, attempts, next_attempt_at, error),
+            )
+
+    def clear_push_retry(self, branch):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM outbox WHERE repo = ? AND branch = ?", (self.repo, branch))
+
+    def history_head(self, branch):
+        """Return (sha, total) of the last history walk cached for `branch`, or None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT sha, total FROM history_heads WHERE repo = ? AND branch = ?",
+                (self.repo, branch),
+            ).fetchone()
+
+    def add_history(self, branch, sha, new_commits, day_counts, reset=False):
+        """Fold `day_counts` ({date: commits}) into the cached histogram and move its head to `sha`
+
+        With `reset` the cached histogram is replaced (the branch was rewritten).
+        """
+        with self._lock, self._conn:
+            if reset:
+                self._conn.execute(
+                    "DELETE FROM history_days WHERE repo = ? AND branch = ?", (self.repo, branch)
+                )
+                self._conn.execute(
+                    "DELETE FROM history_heads WHERE repo = ? AND branch = ?", (self.repo, branch)
+                )
+            self._conn.executemany(
+                "INSERT INTO history_days (repo, branch, day, commits) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (repo, branch, day) DO UPDATE SET commits = commits + excluded.commits",
+                [(self.repo, branch, day.isoformat(), count) for day, count in day_counts.items()],
+            )
+            self._conn.execute(
+                "INSERT INTO history_heads (repo, branch, sha, total) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (repo, branch) DO UPDATE SET sha = excluded.sha, total = total + excluded.total",
+                (self.repo, branch, sha, new_commits),
+            )
+
+    def history_days(self, branch):
+        """Yield (date, commits) from the cached histogram, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, commits FROM history_days WHERE repo = ? AND branch = ? ORDER BY day",
+                (self.repo, branch),
+            ).fetchall()
+        for day, commits in rows:
+            yield date.fromisoformat(day), commits
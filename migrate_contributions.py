@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Migrate a flat contributions/ directory to another storage layout
+Moves every contribution_YYYYMMDD_HHMMSS.md file into the sharded or monthly
+layout and records the move as a single commit.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from storage import LAYOUTS, create_layout, flat_contributions
+
+
+def run_command(command, description, cwd):
+    """Run a git command and handle errors"""
+    print(f"🔄 {description}...")
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"❌ {description} failed: {result.stderr.strip()}")
+        return False
+    print(f"✅ {description} completed")
+    return True
+
+
+def migrate(repo_dir, layout_name, commit=True, dry_run=False):
+    """Rewrite flat contribution files into `layout_name`; returns the number migrated"""
+    layout = create_layout(layout_name, Config.CONTRIBUTIONS_DIR)
+    files = flat_contributions(repo_dir, Config.CONTRIBUTIONS_DIR)
+    if not files:
+        print("✅ No flat contribution files to migrate")
+        return 0
+
+    print(f"📦 Migrating {len(files)} contribution files to the {layout.name} layout")
+    written = {}
+
+    def read_existing(path):
+        if path in written:
+            return written[path]
+        full_path = os.path.join(repo_dir, path)
+        if os.path.exists(full_path):
+            with open(full_path) as f:
+                return f.read()
+        return None
+
+    for when, old_path in files:
+        with open(os.path.join(repo_dir, old_path)) as f:
+            entry = f.read()
+        new_path, content = layout.render(when, entry, read_existing)
+        written[new_path] = content
+        if dry_run:
+            print(f"   {old_path} -> {new_path}")
+
+    if dry_run:
+        print(f"🧪 Dry run: {len(files)} files would become {len(written)} files")
+        return len(files)
+
+    for new_path, content in written.items():
+        full_path = os.path.join(repo_dir, new_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+    for _, old_path in files:
+        os.remove(os.path.join(repo_dir, old_path))
+
+    if commit:
+        if not run_command(["git", "add", "-A", Config.CONTRIBUTIONS_DIR], "Staging migrated files", repo_dir):
+            return 0
+        message = f"Migrate contributions to {layout.name} layout"
+        if not run_command(["git", "commit", "-q", "-m", message], "Committing migration", repo_dir):
+            return 0
+
+    print(f"🎉 Migrated {len(files)} files into {len(written)} {layout.name} files")
+    print(f"💡 Set CONTRIBUTIONS_LAYOUT={layout.name} in .env so new commits use it")
+    return len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate flat contribution files to another layout")
+    parser.add_argument("layout", choices=[name for name in LAYOUTS if name != "flat"])
+    parser.add_argument("--repo-dir", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="clone to migrate (default: this directory)")
+    parser.add_argument("--no-commit", action="store_true", help="move files but do not commit")
+    parser.add_argument("--dry-run", action="store_true", help="only print the planned moves")
+    args = parser.parse_args()
+
+    migrate(args.repo_dir, args.layout, commit=not args.no_commit, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Durable push outbox for GitHub Commit Bot
+A commit whose push fails stays in the ledger as unpushed. The outbox retries
+the push from a background thread with exponential backoff and jitter, and
+each retry pushes everything queued at once. The queue lives in the ledger, so
+it survives restarts and the daily check does not commit again meanwhile.
+"""
+
+import random
+import threading
+import time
+
+from config import Config
+from tracing import phase
+
+
+class PushOutbox:
+    """Failed-push retry state and drainer thread for one branch of a clone"""
+
+    def __init__(self, ledger, branch, push, base_delay=None, max_delay=None, clock=time.time,
+                 rand=random.random):
+        self.ledger = ledger
+        self.branch = branch
+        self._push = push
+        self.base_delay = Config.OUTBOX_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = Config.OUTBOX_MAX_DELAY if max_delay is None else max_delay
+        self.clock = clock
+        self.rand = rand
+        # Held while committing to or pushing the clone so the drainer never races a commit
+        self.lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+
+    def depth(self):
+        """Number of commits waiting to be pushed"""
+        return self.ledger.unpushed_count(self.branch)
+
+    def backoff(self, attempts):
+        """Delay before retry number `attempts`: doubling, capped, with the upper half jittered"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay / 2 + self.rand() * delay / 2
+
+    def push(self):
+        """Push the branch now; on failure queue every unpushed commit for a retry
+
+        Returns True if the push went through.
+        """
+        with self.lock:
+            try:
+                with phase("push"):
+                    pushed = self._push()
+                error = None if pushed else "push failed"
+            except Exception as e:
+                pushed, error = False, str(e)
+
+            if pushed:
+                self.ledger.mark_pushed([sha for sha, _ in self.ledger.unpushed(self.branch)])
+                if self.ledger.outbox_state(self.branch):
+                    self.ledger.clear_push_retry(self.branch)
+                return True
+
+            state = self.ledger.outbox_state(self.branch)
+            attempts = (state[0] if state else 0) + 1
+            delay = self.backoff(attempts)
+            self.ledger.schedule_push_retry(self.branch, attempts, self.clock() + delay, error)
+        print(f"📮 Push failed ({error}): {self.depth()} commits queued, retry #{attempts} in {delay:.0f}s")
+        self.start()
+        return False
+
+    def drain(self, force=False):
+        """Retry the queued push once it is due (or right away with `force`)
+
+        Returns True when nothing is left in the queue.
+        """
+        if not self.depth():
+            return True
+        state = self.ledger.outbox_state(self.branch)
+        if state and not force and state[1] > self.clock():
+            return False
+        if self.push():
+            print(f"📬 Pushed queued commits to {self.branch}")
+            return True
+        return False
+
+    def start(self):
+        """Run the drainer thread until the queue is empty"""
+        with self._thread_lock:
+            if self._thread is not None or self._stopped:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"outbox-{self.ledger.repo}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            with self._thread_lock:
+                if not self.depth():
+                    self._thread = None
+                    return
+            state = self.ledger.outbox_state(self.branch)
+            wait = max(0.0, state[1] - self.clock()) if state else 0.0
+            if self._wake.wait(wait):
+                self._wake.clear()
+                continue
+            self.drain()
+        with self._thread_lock:
+            self._thread = None
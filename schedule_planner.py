@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Schedule planner for GitHub Commit Bot
+Turns a policy such as "4@09:00-12:00,14:00-22:00" (4 fire times a day inside
+those windows) into fire times per repository. The times are deterministic
+(a hash of the repository name) but spread evenly over the windows, so a
+fleet no longer fires at the same second. Run this file to preview the
+resulting API request and push rate per minute.
+"""
+
+import argparse
+import hashlib
+from collections import Counter
+
+from config import Config
+from scheduler import parse_time
+
+DAY = 24 * 3600
+# API requests of the first fire of a day: the head check, plus the Git Data
+# API calls of a remote-only commit. Later fires are answered by the ledger.
+REQUESTS_PER_COMMIT = {"local": 1, "remote": 4}
+
+
+class SchedulePolicy:
+    """N fire times a day placed inside one or more daily windows"""
+
+    def __init__(self, commits_per_day, windows, salt=""):
+        if commits_per_day < 1:
+            raise ValueError("A schedule policy needs at least one commit per day")
+        self.commits_per_day = commits_per_day
+        self.windows = windows  # [(start second, length in seconds)]
+        self.salt = salt
+        self.length = sum(length for _, length in windows)
+        if not self.length:
+            raise ValueError("Schedule policy windows are empty")
+
+    def _second_of_day(self, offset):
+        for start, length in self.windows:
+            if offset < length:
+                return int(start + offset) % DAY
+            offset -= length
+        start, length = self.windows[-1]
+        return int(start + length - 1) % DAY
+
+    def times_for(self, key):
+        """Fire times ("HH:MM:SS") for `key`, one in each equal slice of the windows
+
+        Each slice gets a position derived from a hash of the key, so the
+        same repository always gets the same times and a fleet of them covers
+        every slice evenly. Only the first fire of a day commits (later ones
+        find today's commit in the ledger), so the commit load follows the
+        first slice; use fewer, wider windows to spread it further.
+        """
+        slot = self.length / self.commits_per_day
+        times = []
+        for i in range(self.commits_per_day):
+            digest = hashlib.sha256(f"{self.salt}:{key}:{i}".encode()).digest()
+            fraction = int.from_bytes(digest[:8], "big") / 2 ** 64
+            second = self._second_of_day((i + fraction) * slot)
+            times.append(f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}")
+        return sorted(times)
+
+
+def _parse_window(text):
+    try:
+        start_text, end_text = text.split("-")
+    except ValueError:
+        raise ValueError(f"Invalid schedule window: {text!r} (expected HH:MM-HH:MM)")
+    start_h, start_m, start_s = parse_time(start_text.strip())
+    end_h, end_m, end_s = parse_time(end_text.strip())
+    start = start_h * 3600 + start_m * 60 + start_s
+    end = end_h * 3600 + end_m * 60 + end_s
+    # A window ending before it starts runs past midnight
+    return start, (end - start) % DAY or DAY
+
+
+def parse_policy(value):
+    """Read a policy from "N@HH:MM-HH:MM,..." or a {commits_per_day, windows, salt} mapping"""
+    if isinstance(value, SchedulePolicy):
+        return value
+    if isinstance(value, str):
+        count, _, windows = value.partition("@")
+        try:
+            count = int(count)
+        except ValueError:
+            raise ValueError(f"Invalid schedule policy: {value!r} (expected e.g. 4@09:00-12:00,14:00-22:00)")
+        return SchedulePolicy(count, [_parse_window(w) for w in (windows or "00:00-00:00").split(",")])
+    windows = value.get("windows") or ["00:00-00:00"]
+    if isinstance(windows, str):
+        windows = windows.split(",")
+    return SchedulePolicy(int(value["commits_per_day"]), [_parse_window(w) for w in windows],
+                          str(value.get("salt", "")))
+
+
+def commit_times_for(full_name, policy=None):
+    """Fire times for a repository: planned from `policy` or SCHEDULE_POLICY, else COMMIT_TIMES"""
+    policy = policy or Config.SCHEDULE_POLICY
+    if not policy:
+        return list(Config.COMMIT_TIMES)
+    return parse_policy(policy).times_for(full_name)
+
+
+def request_rate(specs):
+    """Return (API requests, pushes) per minute of the day for the first fire of each repository"""
+    requests = Counter()
+    pushes = Counter()
+    for spec in specs:
+        hour, minute, _ = min(parse_time(t) for t in spec.schedule)
+        minute_of_day = hour * 60 + minute
+        requests[minute_of_day] += REQUESTS_PER_COMMIT["remote" if spec.remote_only else "local"]
+        if not spec.remote_only:
+            pushes[minute_of_day] += 1
+    return requests, pushes
+
+
+def _minute(minute_of_day):
+    return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
+def print_preview(label, specs, top=5):
+    requests, pushes = request_rate(specs)
+    if not requests:
+        print(f"{label}: no fires")
+        return
+    busiest = requests.most_common(top)
+    print(f"{label}: {sum(requests.values())} requests over {len(requests)} active minutes, "
+          f"peak {busiest[0][1]} requests/min at {_minute(busiest[0][0])}, "
+          f"peak {max(pushes.values(), default=0)} pushes/min")
+    for minute_of_day, count in sorted(busiest):
+        print(f"   {_minute(minute_of_day)} {count:>6} requests {pushes[minute_of_day]:>6} pushes")
+
+    hourly = Counter()
+    for minute_of_day, count in requests.items():
+        hourly[minute_of_day // 60] += count
+    scale = max(hourly.values())
+    for hour in range(min(hourly), max(hourly) + 1):
+        bar = "█" * round(hourly[hour] * 40 / scale) if hourly[hour] else ""
+        print(f"   {hour:02d}h {hourly[hour]:>7} {bar}")
+
+
+def main():
+    from fleet import RepoSpec, load_manifest
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--manifest", help="preview the repositories of this manifest")
+    parser.add_argument("--policy", help='policy to apply, e.g. "4@09:00-12:00,14:00-22:00" '
+                                         "(default: each repository's own, then SCHEDULE_POLICY)")
+    parser.add_argument("--repos", type=int, default=0,
+                        help="add this many synthetic repositories to the preview")
+    parser.add_argument("--remote-only", action="store_true", help="treat synthetic repositories as remote-only")
+    parser.add_argument("--top", type=int, default=5, help="show the N busiest minutes")
+    args = parser.parse_args()
+
+    specs = load_manifest(args.manifest)[0] if args.manifest else []
+    specs += [RepoSpec("fleet", f"repo-{i}", remote_only=args.remote_only) for i in range(args.repos)]
+    if not specs:
+        specs = [RepoSpec(Config.REPO_OWNER, Config.GITHUB_REPO, remote_only=Config.REMOTE_ONLY)]
+    if args.policy:
+        specs = [RepoSpec(s.owner, s.repo, s.branch, None, s.path, s.remote_only, args.policy) for s in specs]
+    fixed = [RepoSpec(s.owner, s.repo, s.branch, Config.COMMIT_TIMES, s.path, s.remote_only) for s in specs]
+
+    print(f"📈 Request rate preview for {len(specs)} repositories")
+    print_preview("⏰ Fixed COMMIT_TIMES", fixed, args.top)
+    print_preview("🎲 Planned schedule", specs, args.top)
+    if len(specs) <= 20:
+        print("🗓️  Fire times:")
+        for spec in specs:
+            print(f"   {spec.full_name}: {', '.join(spec.schedule)}")
+
+
+if __name__ == "__main__":
+    main()
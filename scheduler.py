@@ -0,0 +1,170 @@
+"""
+Event-driven daily scheduler for GitHub Commit Bot
+Sleeps until the next due job instead of polling, runs due jobs concurrently
+up to a cap, and records next-fire-time and lag metrics.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Upper bound on one sleep so wall-clock jumps (NTP, suspend, DST) are noticed
+MAX_SLEEP = 300
+
+
+def parse_time(time_str):
+    """Parse a Config.COMMIT_TIMES entry ("HH:MM" or "HH:MM:SS") into (h, m, s)"""
+    parts = time_str.split(":")
+    try:
+        if len(parts) not in (2, 3):
+            raise ValueError
+        hour, minute, second = (int(p) for p in parts + ["0"] * (3 - len(parts)))
+    except ValueError:
+        raise ValueError(f"Invalid time format: {time_str!r} (expected HH:MM or HH:MM:SS)")
+    if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60):
+        raise ValueError(f"Invalid time of day: {time_str!r}")
+    return hour, minute, second
+
+
+class Job:
+    """A callable that fires once a day at a fixed local time"""
+
+    def __init__(self, time_str, func, args=(), kwargs=None, name=None):
+        self.time_str = time_str
+        self.at = parse_time(time_str)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.name = name or f"{getattr(func, '__name__', 'job')}@{time_str}"
+        self.next_run = None
+        self.last_run = None
+        self.last_lag = None
+        self.last_duration = None
+        self.runs = 0
+        self.failures = 0
+        self.running = 0
+
+    def schedule_next(self, now):
+        hour, minute, second = self.at
+        candidate = now.replace(hour=hour, minute=minute, second=second, microsecond=0)
+        if candidate <= now:
+            candidate += timedelta(days=1)
+        self.next_run = candidate
+        return candidate
+
+
+class AsyncScheduler:
+    """Run daily jobs on an asyncio loop with a concurrency cap"""
+
+    def __init__(self, max_concurrency=4, clock=datetime.now):
+        self.max_concurrency = max_concurrency
+        self.clock = clock
+        self.jobs = []
+        self._loop = None
+        self._wakeup = None
+        self._semaphore = None
+        self._executor = None
+        self._tasks = set()
+        self._stopping = False
+
+    def every_day_at(self, time_str, func, *args, name=None, **kwargs):
+        """Register `func(*args, **kwargs)` to run daily at `time_str`"""
+        job = Job(time_str, func, args, kwargs, name)
+        job.schedule_next(self.clock())
+        self.jobs.append(job)
+        self._notify()
+        return job
+
+    def next_fire_time(self):
+        runs = [job.next_run for job in self.jobs if job.next_run]
+        return min(runs) if runs else None
+
+    def metrics(self):
+        """Snapshot of per-job schedule and lag statistics"""
+        return {
+            "next_fire_time": self.next_fire_time(),
+            "running": sum(job.running for job in self.jobs),
+            "jobs": [
+                {
+                    "name": job.name,
+                    "at": job.time_str,
+                    "next_run": job.next_run,
+                    "last_run": job.last_run,
+                    "last_lag_seconds": job.last_lag,
+                    "last_duration_seconds": job.last_duration,
+                    "runs": job.runs,
+                    "failures": job.failures,
+                }
+                for job in self.jobs
+            ],
+        }
+
+    def _notify(self):
+        # Safe to call from job threads as well as from the loop itself
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def stop(self):
+        self._stopping = True
+        self._notify()
+
+    async def _run_job(self, job, due):
+        async with self._semaphore:
+            started = self.clock()
+            job.last_run = started
+            job.last_lag = (started - due).total_seconds()
+            job.running += 1
+            start = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(job.func):
+                    await job.func(*job.args, **job.kwargs)
+                else:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(self._executor, lambda: job.func(*job.args, **job.kwargs))
+            except Exception as e:
+                job.failures += 1
+                print(f"💥 Scheduled job {job.name} failed: {e}")
+            finally:
+                job.running -= 1
+                job.runs += 1
+                job.last_duration = time.perf_counter() - start
+
+    def _launch_due(self):
+        now = self.clock()
+        for job in self.jobs:
+            if job.next_run is not None and job.next_run <= now:
+                due = job.next_run
+                job.schedule_next(max(now, due))
+                task = asyncio.create_task(self._run_job(job, due))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def run(self):
+        """Serve jobs until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="job")
+        try:
+            while not self._stopping:
+                self._launch_due()
+                next_run = self.next_fire_time()
+                delay = MAX_SLEEP
+                if next_run is not None:
+                    delay = min(max((next_run - self.clock()).total_seconds(), 0), MAX_SLEEP)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            self._executor.shutdown(wait=True)
+            self._loop = None
+            self._wakeup = None
+
+    def run_forever(self):
+        asyncio.run(self.run())
@@ -4,6 +4,7 @@ Setup script for GitHub Commit Bot
 This script helps initialize the repository and set up the environment.
 """
 
+import argparse
 import os
 import subprocess
 import sys
@@ -19,12 +20,17 @@ def run_command(command, description):
         print(f"❌ {description} failed: {e.stderr}")
         return False
 
-def setup_git_repo():
+def setup_git_repo(bootstrap_url=None):
     """Initialize git repository if not already initialized"""
     if os.path.exists('.git'):
         print("✅ Git repository already initialized")
         return True
     
+    if bootstrap_url:
+        # Only the latest commit and the bot's own files, not every contribution ever made
+        from bootstrap import bootstrap_repository
+        return bootstrap_repository(bootstrap_url, ".")
+    
     commands = [
         ("git init", "Initializing git repository"),
         ("git add .", "Adding files to git"),
@@ -64,6 +70,11 @@ def install_dependencies():
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(description="Set up GitHub Commit Bot")
+    parser.add_argument("--bootstrap", metavar="URL",
+                        help="attach to this existing repository with a shallow, sparse clone instead of git init")
+    args = parser.parse_args()
+    
     print("🚀 Setting up GitHub Commit Bot...")
     print("=" * 50)
     
@@ -85,7 +96,7 @@ def main():
         sys.exit(1)
     
     # Setup git repository
-    if not setup_git_repo():
+    if not setup_git_repo(args.bootstrap):
         print("❌ Failed to setup git repository")
         sys.exit(1)
     
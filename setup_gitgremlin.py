@@ -4,6 +4,7 @@ Setup script specifically for Gitgremlin repository
 This script sets up the bot for the nikhil-shr-23/Gitgremlin repository
 """
 
+import argparse
 import os
 import subprocess
 import sys
@@ -19,7 +20,7 @@ def run_command(command, description):
         print(f"❌ {description} failed: {e.stderr}")
         return False
 
-def setup_gitgremlin():
+def setup_gitgremlin(bootstrap=False):
     """Setup specifically for Gitgremlin repository"""
     print("🚀 Setting up GitHub Commit Bot for Gitgremlin repository...")
     print("=" * 60)
@@ -35,25 +36,31 @@ REPO_OWNER=nikhil-shr-23"""
     
     print("✅ Created .env file with Gitgremlin repository settings")
     
-    # Initialize git if not already done
-    if not os.path.exists('.git'):
-        commands = [
-            ("git init", "Initializing git repository"),
-            ("git branch -M main", "Setting default branch to main"),
-        ]
-        
-        for command, description in commands:
-            if not run_command(command, description):
-                return False
-    
-    # Add remote origin
-    remote_url = "https://github.com/nikhil-shr-23/Gitgremlin.git"
-    run_command(f"git remote add origin {remote_url}", "Adding GitHub remote")
-    
-    # Install dependencies
+    # Install dependencies first: bootstrap imports config, which needs python-dotenv
     if not run_command("pip install -r requirements.txt", "Installing dependencies"):
         return False
     
+    remote_url = "https://github.com/nikhil-shr-23/Gitgremlin.git"
+    if bootstrap:
+        # Shallow, blobless and sparse: provisioning no longer grows with the contribution history
+        from bootstrap import bootstrap_repository
+        if not bootstrap_repository(remote_url, ".", "main"):
+            return False
+    else:
+        # Initialize git if not already done
+        if not os.path.exists('.git'):
+            commands = [
+                ("git init", "Initializing git repository"),
+                ("git branch -M main", "Setting default branch to main"),
+            ]
+            
+            for command, description in commands:
+                if not run_command(command, description):
+                    return False
+        
+        # Add remote origin
+        run_command(f"git remote add origin {remote_url}", "Adding GitHub remote")
+    
     print("\n" + "=" * 60)
     print("🎉 Setup completed for Gitgremlin repository!")
     print("\n📋 Next steps:")
@@ -68,4 +75,7 @@ REPO_OWNER=nikhil-shr-23"""
     return True
 
 if __name__ == "__main__":
-    setup_gitgremlin()
+    parser = argparse.ArgumentParser(description="Set up the bot for the Gitgremlin repository")
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="shallow, sparse clone of the existing repository instead of git init")
+    setup_gitgremlin(parser.parse_args().bootstrap)
@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""
+Capacity simulator for GitHub Commit Bot
+Replays days of a schedule on a virtual clock. The real AsyncScheduler fires
+FleetRunner cycles and every repository runs the real run_daily_commit, but
+git and the GitHub API are in-process stand-ins with sampled latencies, so a
+month or a year of a fleet takes seconds. Reports API requests and pushes per
+minute, peak concurrency, where the rate-limit budget ran out, and how long
+commits took from their fire time to landing on GitHub.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import heapq
+import json
+import math
+import os
+import random
+import selectors
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+from config import Config
+from fleet import FleetRunner, RepoSpec, load_manifest
+from git_backend import PushStats
+from github_client import PooledConnection
+from governor import RateGovernor, RateLimitExceeded
+from scheduler import AsyncScheduler
+
+DAY = 24 * 3600
+API_URL = "https://api.github.invalid"
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _local(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _minute(minute):
+    return datetime.fromtimestamp(minute * 60).strftime("%Y-%m-%d %H:%M")
+
+
+class Run:
+    """One repository's daily commit run, in virtual seconds"""
+
+    def __init__(self, repo, due, start):
+        self.repo = repo
+        self.due = due
+        self.start = start
+        self.at = start  # advances with every request, push and wait of the run
+        self.requests = 0
+        self.pushes = 0
+        self.commits = 0
+        self.ok = False
+
+
+class VirtualClock:
+    """Simulated wall clock
+
+    The event loop moves the shared time forward between fires. A run gets
+    its own cursor that starts when a worker picks it up and advances by the
+    latency of everything it does, so runs of one cycle overlap the way they
+    would on real workers.
+    """
+
+    def __init__(self, start):
+        self.origin = start.timestamp()
+        self.elapsed = 0.0
+        self._local = threading.local()
+
+    def current(self):
+        return getattr(self._local, "run", None)
+
+    def time(self):
+        run = self.current()
+        return run.at if run else self.origin + self.elapsed
+
+    def now(self):
+        return datetime.fromtimestamp(self.time())
+
+    def spend(self, seconds):
+        """Charge `seconds` to the current run (also the governor's sleep)"""
+        run = self.current()
+        if run:
+            run.at += seconds
+        else:
+            self.elapsed += seconds
+
+    def enter(self, run):
+        self._local.run = run
+
+    def leave(self):
+        self._local.run = None
+
+
+class _IdleSelector(selectors.DefaultSelector):
+    """Selector that moves the clock ahead instead of sleeping while no job runs"""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+        self.busy = 0
+
+    def select(self, timeout=None):
+        if self.busy:
+            # A job thread is running: wait (for real) until it hands its result back
+            return super().select(0 if timeout == 0 else None)
+        if timeout:
+            self.clock.elapsed += timeout
+        return super().select(None if timeout is None else 0)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """asyncio loop on a VirtualClock: waiting for the next fire takes no real time"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._idle = _IdleSelector(clock)
+        super().__init__(self._idle)
+        # A year is past 2**24 seconds, where adding the default 1ns resolution no longer changes
+        # the float time and a due timer would never look due
+        self._clock_resolution = 1e-6
+
+    def time(self):
+        return self.clock.elapsed
+
+    def run_in_executor(self, executor, func, *args):
+        self._idle.busy += 1
+        future = super().run_in_executor(executor, func, *args)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        self._idle.busy -= 1
+
+
+class _Response:
+    # the parts of a requests.Response that PooledConnection reads
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+
+class SimulatedGitHub:
+    """In-process GitHub API for many repositories, with an hourly request budget
+
+    It stands in for the requests session under PooledConnection, so PyGithub,
+    the governor and the bot's own request logic run unchanged. Every request
+    costs a sampled latency on the caller's virtual clock. File contents are
+    not kept: reads find no file and trees only get a fresh SHA.
+    """
+
+    def __init__(self, clock, rate_limit=5000, latency=0.3, rand=None):
+        self.clock = clock
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.rand = rand or random.Random()
+        self.remaining = rate_limit
+        self.lowest = rate_limit
+        self.reset = None
+        self.repositories = set()
+        self.heads = {}  # (full name, branch) -> head commit SHA
+        self.commits = {}  # SHA -> {"date", "tree", "parents", "message"}
+        self.requests = []  # (time, "VERB endpoint", status)
+        self.pushes = []  # push times
+        self.exhausted = []  # (time the budget ran out, time it reset)
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def sample(self, median):
+        """A latency around `median` seconds with a long right tail"""
+        return self.rand.lognormvariate(math.log(median), 0.5) if median > 0 else 0.0
+
+    def _sha(self, *parts):
+        self._counter += 1
+        return hashlib.sha1(repr(parts + (self._counter,)).encode()).hexdigest()
+
+    def _new_commit(self, message, tree, parents, date):
+        sha = self._sha("commit", message, tree, tuple(parents))
+        self.commits[sha] = {"date": date, "tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def add_repository(self, full_name, branch, date):
+        """Create `full_name` with one commit on `branch` dated `date`"""
+        with self._lock:
+            self.repositories.add(full_name)
+            self.heads[(full_name, branch)] = self._new_commit("Initial commit", self._sha("tree"), [],
+                                                               date.timestamp())
+
+    def receive_push(self, full_name, branch, commits):
+        """Land (sha, message, timestamp) commits from a clone on top of the branch"""
+        with self._lock:
+            for sha, message, when in commits:
+                parent = self.heads.get((full_name, branch))
+                self.commits[sha] = {"date": when, "tree": self._sha("tree"), "message": message,
+                                     "parents": [parent] if parent else []}
+                self.heads[(full_name, branch)] = sha
+            self.pushes.append(self.clock.time())
+        run = self.clock.current()
+        if run:
+            run.pushes += 1
+            run.commits += len(commits)
+
+    # -- session interface ---------------------------------------------------
+
+    def request(self, verb, url, headers=None, data=None, **kwargs):
+        now = self.clock.time()
+        path = urlparse(url).path
+        parts = [p for p in path.split("/") if p]
+        with self._lock:
+            if self.reset is None or now >= self.reset:
+                self.remaining, self.reset = self.rate_limit, now + 3600
+            if self.remaining <= 0:
+                self.rejected += 1
+                status, payload, landed = 403, {"message": "API rate limit exceeded"}, 0
+            else:
+                self.remaining -= 1
+                self.lowest = min(self.lowest, self.remaining)
+                if not self.remaining:
+                    self.exhausted.append((now, self.reset))
+                status, payload, landed = self._handle(verb, parts, json.loads(data) if data else None, now)
+            self.requests.append((now, f"{verb} {self._endpoint(parts)}", status))
+            response_headers = {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self.remaining),
+                "X-RateLimit-Reset": str(int(self.reset)),
+            }
+        run = self.clock.current()
+        if run:
+            run.requests += 1
+            run.commits += landed
+        self.clock.spend(self.sample(self.latency))
+        return _Response(status, response_headers, json.dumps(payload))
+
+    def close(self):
+        return
+
+    @staticmethod
+    def _endpoint(parts):
+        rest = parts[3:]
+        if not rest:
+            return "repo"
+        if rest[0] == "git":
+            return "/".join(rest[:2])
+        return rest[0]
+
+    # -- API -----------------------------------------------------------------
+
+    def _repo_json(self, full_name):
+        owner, name = full_name.split("/")
+        return {"id": 1, "name": name, "full_name": full_name, "owner": {"login": owner},
+                "private": False, "url": f"{API_URL}/repos/{full_name}", "default_branch": Config.GITHUB_BRANCH}
+
+    def _commit_json(self, full_name, sha):
+        commit = self.commits[sha]
+        person = {"name": "bot", "email": "bot@example.com", "date": _iso(commit["date"])}
+        base = f"{API_URL}/repos/{full_name}/git"
+        return {
+            "sha": sha,
+            "url": f"{base}/commits/{sha}",
+            "message": commit["message"],
+            "author": person,
+            "committer": person,
+            "tree": {"sha": commit["tree"], "url": f"{base}/trees/{commit['tree']}"},
+            "parents": [{"sha": p, "url": f"{base}/commits/{p}"} for p in commit["parents"]],
+        }
+
+    def _fast_forward(self, full_name, branch, sha):
+        """Move the branch to `sha` if it descends from the head; returns the commits that landed"""
+        head = self.heads.get((full_name, branch))
+        landed, cursor = 0, sha
+        while cursor != head:
+            commit = self.commits.get(cursor)
+            if commit is None or not commit["parents"]:
+                return None
+            landed, cursor = landed + 1, commit["parents"][0]
+        self.heads[(full_name, branch)] = sha
+        return landed
+
+    def _handle(self, verb, parts, body, now):
+        """Return (status, payload, commits landed) for one request"""
+        not_found = (404, {"message": "Not Found"}, 0)
+        if len(parts) < 3 or parts[0] != "repos":
+            return not_found
+        full_name, rest = f"{parts[1]}/{parts[2]}", parts[3:]
+        if full_name not in self.repositories:
+            return not_found
+        if not rest:
+            return 200, self._repo_json(full_name), 0
+
+        if rest[0] == "branches" and len(rest) == 2:
+            head = self.heads.get((full_name, rest[1]))
+            if head is None:
+                return 404, {"message": "Branch not found"}, 0
+            commit = self._commit_json(full_name, head)
+            return 200, {"name": rest[1], "commit": {"sha": head, "url": commit["url"], "commit": commit}}, 0
+
+        if rest[0] == "contents":
+            if verb != "PUT":
+                return not_found
+            branch = body.get("branch", Config.GITHUB_BRANCH)
+            head = self.heads.get((full_name, branch))
+            sha = self._new_commit(body["message"], self._sha("tree"), [head] if head else [], now)
+            self.heads[(full_name, branch)] = sha
+            content = {"path": "/".join(rest[1:]), "name": rest[-1]}
+            return 201, {"content": content, "commit": self._commit_json(full_name, sha)}, 1
+
+        if rest[0] == "git" and len(rest) >= 2:
+            if rest[1] in ("ref", "refs") and rest[2:3] == ["heads"]:
+                branch = "/".join(rest[3:])
+                head = self.heads.get((full_name, branch))
+                if head is None:
+                    return 409, {"message": "Git Repository is empty."}, 0
+                landed = 0
+                if verb == "PATCH":
+                    landed = self._fast_forward(full_name, branch, body["sha"])
+                    if landed is None:
+                        return 422, {"message": "Update is not a fast forward"}, 0
+                head = self.heads[(full_name, branch)]
+                base = f"{API_URL}/repos/{full_name}/git"
+                return 200, {"ref": f"refs/heads/{branch}", "url": f"{base}/refs/heads/{branch}",
+                             "object": {"sha": head, "type": "commit", "url": f"{base}/commits/{head}"}}, landed
+            if rest[1] == "trees" and verb == "POST":
+                sha = self._sha("tree", body.get("base_tree"))
+                return 201, {"sha": sha, "url": f"{API_URL}/repos/{full_name}/git/trees/{sha}", "tree": []}, 0
+            if rest[1] == "commits" and verb == "POST":
+                date = now
+                if body.get("author", {}).get("date"):
+                    date = datetime.fromisoformat(body["author"]["date"].replace("Z", "+00:00")).timestamp()
+                sha = self._new_commit(body["message"], body["tree"], body["parents"], date)
+                return 201, self._commit_json(full_name, sha), 0
+            if rest[1] == "commits" and len(rest) == 3 and rest[2] in self.commits:
+                return 200, self._commit_json(full_name, rest[2]), 0
+        return not_found
+
+
+class SimulatedClone:
+    """Local clone stand-in: a commit costs a few milliseconds, a push lands it on the simulated GitHub"""
+
+    name = "simulated"
+
+    def __init__(self, api, full_name, commit_latency=0.02, push_latency=1.0):
+        self.api = api
+        self.full_name = full_name
+        self.commit_latency = commit_latency
+        self.push_latency = push_latency
+        self.push_stats = PushStats()
+        self.rewritten = {}
+        self._unpushed = []
+
+    def read_file(self, path, branch):
+        return None
+
+    def commit_file(self, path, content, message, branch, when=None):
+        return self.commit_files([(path, content, message, when)], branch)[0]
+
+    def commit_files(self, items, branch, on_commit=None):
+        shas = []
+        for path, _, message, when in items:
+            self.api.clock.spend(self.api.sample(self.commit_latency))
+            when = (when or self.api.clock.now()).timestamp()
+            sha = hashlib.sha1(f"{self.full_name}:{path}:{when}:{len(self._unpushed)}".encode()).hexdigest()
+            self._unpushed.append((sha, message, when))
+            shas.append(sha)
+        if on_commit:
+            for index, sha in enumerate(shas):
+                on_commit(index, sha)
+        return shas
+
+    def push(self, branch, remote="origin"):
+        self.push_stats.pushes += 1
+        self.api.clock.spend(self.api.sample(self.push_latency))
+        self.api.receive_push(self.full_name, branch, self._unpushed)
+        self._unpushed = []
+        return True
+
+
+class _SimulatedGovernor(RateGovernor):
+    """RateGovernor that remembers when a request gave up waiting for budget"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.denied = []
+
+    def acquire(self, priority=None):
+        try:
+            return super().acquire(priority)
+        except RateLimitExceeded:
+            self.denied.append(self.clock())
+            raise
+
+
+@contextlib.contextmanager
+def _overrides(**values):
+    saved = {name: getattr(Config, name) for name in values}
+    for name, value in values.items():
+        setattr(Config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+
+
+def _percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))]
+    return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": values[-1],
+            "mean": sum(values) / len(values)}
+
+
+def _peak_concurrency(runs):
+    # Ends sort before starts at the same instant, so back-to-back runs do not overlap
+    events = sorted([(run.start, 1) for run in runs] + [(run.at, -1) for run in runs])
+    peak, peak_at, active = 0, None, 0
+    for at, step in events:
+        active += step
+        if active > peak:
+            peak, peak_at = active, at
+    return peak, peak_at
+
+
+class Simulation:
+    """Replay `days` of the schedules of `specs` against stand-ins on a virtual clock"""
+
+    def __init__(self, specs, days=30, start=None, concurrency=None, rate_limit=5000, api_latency=0.3,
+                 push_latency=1.0, commit_latency=0.02, seed=0):
+        self.specs = specs
+        self.days = days
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.start = start or midnight + timedelta(days=1)
+        self.concurrency = concurrency or Config.FLEET_CONCURRENCY
+        self.push_latency = push_latency
+        self.commit_latency = commit_latency
+        self.clock = VirtualClock(self.start)
+        self.api = SimulatedGitHub(self.clock, rate_limit, api_latency, random.Random(seed))
+        self.governor = _SimulatedGovernor(Config.GOVERNOR_BURST, Config.GOVERNOR_PACE_BELOW,
+                                           Config.GOVERNOR_MAX_WAIT, clock=self.clock.time, sleep=self.clock.spend)
+        self.runs = []
+        self._lock = threading.Lock()
+        self._workers = [0.0] * self.concurrency  # when each fleet worker is free again
+
+    def _client(self):
+        from github import Github
+
+        client = Github("simulated", base_url=API_URL, timeout=Config.HTTP_TIMEOUT)
+        connection = PooledConnection(API_URL, self.api, Config.HTTP_TIMEOUT, governor=self.governor)
+        client._Github__requester._Requester__connection = connection
+        return client
+
+    def _build_runner(self):
+        from commit_bot import GitHubCommitBot
+
+        runner = FleetRunner(self.specs, self.concurrency, github=self._client(), housekeeping=False)
+        for spec in self.specs:
+            remote_only = Config.REMOTE_ONLY if spec.remote_only is None else spec.remote_only
+            self.api.add_repository(spec.full_name, spec.branch, self.start - timedelta(days=1))
+            git = None if remote_only else SimulatedClone(self.api, spec.full_name, self.commit_latency,
+                                                          self.push_latency)
+            runner._bots[spec.full_name] = GitHubCommitBot(spec.owner, spec.repo, spec.branch, spec.path,
+                                                           remote_only, github=runner.github, git=git,
+                                                           clock=self.clock.now)
+        return runner
+
+    def _daily_commit(self, bot):
+        # Runs on a fleet worker; the loop, and so the shared clock, waits at the cycle's fire time
+        due = self.clock.time()
+        with self._lock:
+            free = heapq.heappop(self._workers)
+        run = Run(f"{bot.repo_owner}/{bot.repo_name}", due, max(due, free))
+        self.clock.enter(run)
+        try:
+            run.ok = bot.run_daily_commit()
+        finally:
+            self.clock.leave()
+            with self._lock:
+                heapq.heappush(self._workers, run.at)
+                self.runs.append(run)
+        return run.ok
+
+    def run(self):
+        """Replay the schedule and return the report"""
+        wall = time.perf_counter()
+        placeholders = {name: getattr(Config, name) or "simulated"
+                        for name in ("GITHUB_TOKEN", "GITHUB_USERNAME", "GITHUB_REPO", "REPO_OWNER")}
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), \
+                _overrides(LEDGER_PATH=":memory:", HOUSEKEEPING_ENABLED=False, **placeholders):
+            runner = self._build_runner()
+            scheduler = AsyncScheduler(max_concurrency=Config.SCHEDULER_CONCURRENCY, clock=self.clock.now)
+            for time_str in runner.commit_times():
+                scheduler.every_day_at(time_str, runner.run_cycle, time_str, action=self._daily_commit,
+                                       name=f"fleet@{time_str}")
+            loop = VirtualTimeLoop(self.clock)
+            loop.call_at(self.days * DAY, scheduler.stop)
+            try:
+                loop.run_until_complete(scheduler.run())
+            finally:
+                loop.close()
+                runner.shutdown()
+        return self.report(time.perf_counter() - wall)
+
+    def report(self, wall_seconds):
+        api = self.api
+        per_minute = Counter(int(at // 60) for at, _, _ in api.requests)
+        per_hour = Counter(int(at // 3600) for at, _, _ in api.requests)
+        pushes_per_minute = Counter(int(at // 60) for at in api.pushes)
+        hour_of_day = Counter(datetime.fromtimestamp(at).hour for at, _, _ in api.requests)
+        committed = [run for run in self.runs if run.commits]
+        peak, peak_at = _peak_concurrency(self.runs)
+        busiest = per_minute.most_common(1)
+        metrics = self.governor.metrics()
+        return {
+            "start": self.start.isoformat(timespec="seconds"),
+            "days": self.days,
+            "repos": len(self.specs),
+            "concurrency": self.concurrency,
+            "wall_seconds": round(wall_seconds, 3),
+            "runs": {
+                "total": len(self.runs),
+                "committed": len(committed),
+                "skipped": sum(1 for run in self.runs if run.ok and not run.commits),
+                "failed": sum(1 for run in self.runs if not run.ok),
+            },
+            "api": {
+                "requests": len(api.requests),
+                "rate_limit": api.rate_limit,
+                "peak_per_minute": busiest[0][1] if busiest else 0,
+                "peak_minute": _minute(busiest[0][0]) if busiest else None,
+                "peak_per_hour": max(per_hour.values(), default=0),
+                "busiest_minutes": [(_minute(minute), count) for minute, count in per_minute.most_common(5)],
+                "by_endpoint": dict(Counter(endpoint for _, endpoint, _ in api.requests).most_common()),
+                "per_hour_of_day": {hour: round(hour_of_day[hour] / self.days, 2) for hour in sorted(hour_of_day)},
+            },
+            "pushes": {
+                "total": len(api.pushes),
+                "peak_per_minute": max(pushes_per_minute.values(), default=0),
+            },
+            "peak_concurrency": {"runs": peak, "at": _local(peak_at) if peak_at else None},
+            "commit_latency_seconds": _percentiles([run.at - run.due for run in committed]),
+            "start_lag_seconds": _percentiles([run.start - run.due for run in self.runs]),
+            "rate_limit": {
+                "exhausted": [{"at": _local(at), "reset": _local(reset)} for at, reset in api.exhausted],
+                "rejected": api.rejected,
+                "gave_up": [_local(at) for at in self.governor.denied],
+                "lowest_remaining": api.lowest,
+                "throttled": metrics["throttled"],
+                "waited_seconds": round(sum(metrics["wait_seconds"].values()), 3),
+            },
+        }
+
+
+def print_report(report, top=5):
+    simulated = report["days"] * DAY
+    print(f"🧪 Simulated {report['days']} days of {report['repos']} repositories from {report['start'][:10]} "
+          f"in {report['wall_seconds']:.1f}s ({simulated / max(report['wall_seconds'], 1e-9):,.0f}x real time)")
+    runs = report["runs"]
+    print(f"🤖 {runs['total']} runs: {runs['committed']} committed, {runs['skipped']} skipped, "
+          f"{runs['failed']} failed")
+
+    api = report["api"]
+    print(f"📈 API requests: {api['requests']} total, peak {api['peak_per_minute']}/min at {api['peak_minute']}, "
+          f"busiest clock hour {api['peak_per_hour']} of {api['rate_limit']}")
+    for endpoint, count in list(api["by_endpoint"].items())[:top]:
+        print(f"   {count:>8} {endpoint}")
+    pushes = report["pushes"]
+    print(f"📤 Pushes: {pushes['total']} total, peak {pushes['peak_per_minute']}/min")
+    peak = report["peak_concurrency"]
+    print(f"🔀 Peak concurrency: {peak['runs']} runs at {peak['at']} (fleet concurrency {report['concurrency']})")
+
+    latency, lag = report["commit_latency_seconds"], report["start_lag_seconds"]
+    if latency:
+        print(f"⏱️  Commit latency from fire time: p50 {latency['p50']:.1f}s, p90 {latency['p90']:.1f}s, "
+              f"p99 {latency['p99']:.1f}s, max {latency['max']:.1f}s (queueing p99 {lag['p99']:.1f}s)")
+
+    limit = report["rate_limit"]
+    if limit["exhausted"] or limit["gave_up"]:
+        print(f"⚠️  Rate limit exhausted {len(limit['exhausted'])} times, {limit['rejected']} requests rejected, "
+              f"{len(limit['gave_up'])} gave up after GOVERNOR_MAX_WAIT, governor waited {limit['waited_seconds']:.0f}s")
+        for point in limit["exhausted"][:top]:
+            print(f"   - {point['at']} (budget back at {point['reset'][11:]})")
+    else:
+        print(f"🛡️  Rate limit never exhausted: lowest remaining {limit['lowest_remaining']}/{api['rate_limit']}, "
+              f"governor waited {limit['waited_seconds']:.1f}s")
+
+    hours = api["per_hour_of_day"]
+    if hours:
+        print("🕘 API requests per hour of day (daily average):")
+        scale = max(hours.values())
+        for hour in range(min(hours), max(hours) + 1):
+            count = hours.get(hour, 0)
+            print(f"   {hour:02d}h {count:>9.1f} {'█' * round(count * 40 / scale)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--manifest", help="simulate the repositories of this manifest")
+    parser.add_argument("--repos", type=int, default=0, help="add this many synthetic repositories")
+    parser.add_argument("--remote-only", action="store_true", help="synthetic repositories commit through the API")
+    parser.add_argument("--policy", help='schedule policy for every repository, e.g. "4@09:00-12:00,14:00-22:00"')
+    parser.add_argument("--times", help="comma-separated fire times for every repository (e.g. 09:00,21:45)")
+    parser.add_argument("--days", type=int, default=30, help="days to replay (default: 30)")
+    parser.add_argument("--start", type=lambda value: datetime.strptime(value, "%Y-%m-%d"),
+                        help="first simulated day, YYYY-MM-DD (default: tomorrow)")
+    parser.add_argument("--concurrency", type=int,
+                        help="parallel repositories (default: the manifest's, then FLEET_CONCURRENCY)")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="API requests per hour (default: 5000)")
+    parser.add_argument("--api-latency", type=float, default=0.3, help="median seconds per API request")
+    parser.add_argument("--push-latency", type=float, default=1.0, help="median seconds per git push")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the sampled latencies")
+    parser.add_argument("--top", type=int, default=5, help="show the N busiest endpoints and exhaustion points")
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    args = parser.parse_args()
+
+    specs, settings = load_manifest(args.manifest) if args.manifest else ([], {})
+    specs += [RepoSpec("fleet", f"repo-{i}", remote_only=args.remote_only) for i in range(args.repos)]
+    if not specs:
+        specs = [RepoSpec(Config.REPO_OWNER or "simulated", Config.GITHUB_REPO or "simulated",
+                          remote_only=Config.REMOTE_ONLY or args.remote_only)]
+    if args.policy or args.times:
+        times = [t.strip() for t in args.times.split(",")] if args.times else None
+        specs = [RepoSpec(s.owner, s.repo, s.branch, times, s.path, s.remote_only, args.policy) for s in specs]
+
+    simulation = Simulation(specs, args.days, args.start, args.concurrency or settings.get("concurrency"),
+                            args.rate_limit, args.api_latency, args.push_latency, seed=args.seed)
+    report = simulation.run()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
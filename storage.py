@@ -0,0 +1,79 @@
+"""
+Contribution file layouts for GitHub Commit Bot
+Decides where each contribution is written inside Config.CONTRIBUTIONS_DIR.
+"""
+
+import os
+import re
+from datetime import datetime
+
+ENTRY_SEPARATOR = "\n---\n\n"
+FLAT_NAME = re.compile(r"^contribution_(\d{8})_(\d{6})\.md$")
+
+
+class FlatLayout:
+    """One file per contribution in a single directory (the original layout)"""
+
+    name = "flat"
+
+    def __init__(self, root, extension=".md", separator=ENTRY_SEPARATOR):
+        self.root = root
+        self.extension = extension
+        self.separator = separator
+
+    def path_for(self, when):
+        return f"{self.root}/contribution_{when.strftime('%Y%m%d_%H%M%S')}{self.extension}"
+
+    def render(self, when, entry, read_existing):
+        return self.path_for(when), entry
+
+
+class ShardedLayout(FlatLayout):
+    """One file per contribution under year/month/day subdirectories
+
+    Every directory stays small, so each commit rewrites a few small tree
+    objects instead of one tree listing the whole history.
+    """
+
+    name = "sharded"
+
+    def path_for(self, when):
+        return f"{self.root}/{when:%Y/%m/%d}/contribution_{when:%H%M%S}{self.extension}"
+
+
+class MonthlyLogLayout(FlatLayout):
+    """Append every contribution of a month to one log file"""
+
+    name = "monthly"
+
+    def path_for(self, when):
+        return f"{self.root}/{when:%Y}/{when:%Y-%m}{self.extension}"
+
+    def render(self, when, entry, read_existing):
+        path = self.path_for(when)
+        existing = read_existing(path)
+        return path, f"{existing}{self.separator}{entry}" if existing else entry
+
+
+LAYOUTS = {layout.name: layout for layout in (FlatLayout, ShardedLayout, MonthlyLogLayout)}
+
+
+def create_layout(name, root, **options):
+    layout_class = LAYOUTS.get(name)
+    if layout_class is None:
+        raise ValueError(f"Unknown contributions layout: {name} (choose from {', '.join(LAYOUTS)})")
+    return layout_class(root, **options)
+
+
+def flat_contributions(repo_dir, root):
+    """Return (when, relative path) for flat-layout files, oldest first"""
+    directory = os.path.join(repo_dir, root)
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        match = FLAT_NAME.match(name)
+        if match:
+            when = datetime.strptime("".join(match.groups()), "%Y%m%d%H%M%S")
+            found.append((when, f"{root}/{name}"))
+    return sorted(found)
@@ -4,156 +4,62 @@ Test script for GitHub Commit Bot
 This script helps test the bot functionality without making actual commits.
 """
 
+import argparse
+import json
 import os
 import sys
-from datetime import datetime
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config
+from diagnostics import open_cache, print_report, run_diagnostics
+from fleet import RepoSpec
 
-def test_configuration():
-    """Test if configuration is properly set up"""
-    print("🧪 Testing configuration...")
-    
-    try:
-        Config.validate()
-        print("✅ Configuration is valid")
-        print(f"   Username: {Config.GITHUB_USERNAME}")
-        print(f"   Repository: {Config.REPO_OWNER}/{Config.GITHUB_REPO}")
-        print(f"   Commit times: {Config.COMMIT_TIMES}")
-        return True
-    except ValueError as e:
-        print(f"❌ Configuration error: {e}")
-        print("💡 Make sure your .env file is properly configured")
-        return False
+TESTS = {
+    "config": "Configuration",
+    "dependencies": "Dependencies",
+    "git": "Git Setup",
+    "token": "GitHub Connection",
+    "repository": "Repository Access",
+}
 
-def test_dependencies():
-    """Test if all required dependencies are installed"""
-    print("\n🧪 Testing dependencies...")
-    
-    dependencies = [
-        ('github', 'PyGithub'),
-        ('schedule', 'schedule'),
-        ('dotenv', 'python-dotenv')
-    ]
-    
-    all_good = True
-    for module, package in dependencies:
-        try:
-            __import__(module)
-            print(f"✅ {package} is installed")
-        except ImportError:
-            print(f"❌ {package} is not installed")
-            all_good = False
-    
-    if not all_good:
-        print("💡 Run: pip install -r requirements.txt")
-    
-    return all_good
+def main():
+    """Run all tests"""
+    parser = argparse.ArgumentParser(description="GitHub Commit Bot - Test Suite")
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached GitHub results")
+    args = parser.parse_args()
 
-def test_git_setup():
-    """Test if git repository is properly set up"""
-    print("\n🧪 Testing git setup...")
-    
-    # Check if git is initialized
-    if not os.path.exists('.git'):
-        print("❌ Git repository not initialized")
-        print("💡 Run: git init")
-        return False
-    
-    print("✅ Git repository is initialized")
-    
-    # Check if we have commits
-    try:
-        result = os.popen('git log --oneline -1').read().strip()
-        if result:
-            print(f"✅ Latest commit: {result}")
-        else:
-            print("⚠️  No commits found")
-        return True
-    except Exception as e:
-        print(f"❌ Git error: {e}")
-        return False
+    cache = None if args.no_cache else open_cache()
+    spec = RepoSpec(Config.REPO_OWNER, Config.GITHUB_REPO, remote_only=Config.REMOTE_ONLY)
+    report = run_diagnostics(spec, list(TESTS), cache=cache)
+    if cache:
+        cache.save()
 
-def test_github_connection():
-    """Test GitHub API connection"""
-    print("\n🧪 Testing GitHub connection...")
-    
-    try:
-        from github import Github
-        
-        # Test token validity
-        github = Github(Config.GITHUB_TOKEN)
-        user = github.get_user()
-        print(f"✅ Connected as: {user.login}")
-        
-        # Test repository access
-        try:
-            repo = github.get_repo(f"{Config.REPO_OWNER}/{Config.GITHUB_REPO}")
-            print(f"✅ Repository access confirmed: {repo.full_name}")
-            
-            # Check if repository is empty
-            try:
-                commits = list(repo.get_commits())
-                if not commits:
-                    print("📝 Repository is empty (no commits yet) - this is normal for new repos")
-                else:
-                    print(f"📊 Repository has {len(commits)} commits")
-            except Exception:
-                print("📝 Repository appears to be empty - this is normal for new repos")
-            
-            return True
-        except Exception as e:
-            print(f"❌ Repository access failed: {e}")
-            print("💡 Check repository name and permissions")
-            print("💡 Make sure the repository exists and your token has access")
-            return False
-            
-    except Exception as e:
-        print(f"❌ GitHub connection failed: {e}")
-        print("💡 Check your GitHub token and network connection")
-        return False
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0 if report["ok"] else 1
 
-def main():
-    """Run all tests"""
     print("🚀 GitHub Commit Bot - Test Suite")
     print("=" * 50)
-    
-    tests = [
-        ("Configuration", test_configuration),
-        ("Dependencies", test_dependencies),
-        ("Git Setup", test_git_setup),
-        ("GitHub Connection", test_github_connection)
-    ]
-    
-    results = []
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} test failed with error: {e}")
-            results.append((test_name, False))
-    
+    print_report(report, TESTS)
+
     print("\n" + "=" * 50)
     print("📊 Test Results:")
-    
-    all_passed = True
-    for test_name, passed in results:
-        status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"   {test_name}: {status}")
-        if not passed:
-            all_passed = False
-    
+
+    for name, result in report["probes"].items():
+        status = {"pass": "✅ PASS", "warn": "✅ PASS", "skip": "⏭️  SKIP"}.get(result["status"], "❌ FAIL")
+        print(f"   {TESTS[name]}: {status}")
+
     print("\n" + "=" * 50)
-    if all_passed:
+    if report["ok"]:
         print("🎉 All tests passed! Your bot is ready to run.")
         print("💡 Run 'python commit_bot.py --test' to create a test commit")
-    else:
-        print("💥 Some tests failed. Please fix the issues above.")
-        print("💡 Run 'python setup.py' to help with initial setup")
+        return 0
+    print("💥 Some tests failed. Please fix the issues above.")
+    print("💡 Run 'python setup.py' to help with initial setup")
+    return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from config import Config
+from daemon import BotDaemon
+
+
+class WarmBot:
+    housekeeper = None
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "GITHUB_TOKEN", "old-token")
+    monkeypatch.setattr(Config, "GITHUB_API_URL", "https://api.github.com")
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"repos": [
+        {"owner": "octo", "repo": "one", "remote_only": True, "schedule": ["09:00"]},
+    ]}))
+    daemon = BotDaemon(str(manifest), path=str(tmp_path / "daemon.sock"))
+    daemon.client = daemon.runner._github = object()
+    daemon.runner._bots = {"octo/one": WarmBot()}
+    yield daemon
+    daemon.runner.shutdown()
+
+
+def test_reload_keeps_warm_client_and_bots(daemon):
+    daemon.overrides = {"GITHUB_TOKEN": "old-token", "GITHUB_API_URL": "https://api.github.com"}
+    daemon._reload()
+    assert daemon.runner._github is daemon.client
+    assert list(daemon.runner._bots) == ["octo/one"]
+
+
+def test_reload_with_rotated_token_builds_fresh_client_and_bots(daemon):
+    daemon.overrides = {"GITHUB_TOKEN": "new-token", "GITHUB_API_URL": "https://api.github.com"}
+    daemon._reload()
+    assert daemon.runner.credentials[0] == "new-token"
+    assert daemon.runner._github is None
+    assert daemon.runner._bots == {}
+
+
+def test_reload_with_new_api_url_builds_fresh_client(daemon):
+    daemon.overrides = {"GITHUB_TOKEN": "old-token", "GITHUB_API_URL": "https://github.example.com/api/v3"}
+    daemon._reload()
+    assert daemon.runner._github is None
+    assert daemon.runner._bots == {}
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from config import Config
+from fleet import FleetRunner, load_manifest
+
+
+def write_manifest(tmp_path, repos):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"repos": repos}))
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def local_clones(monkeypatch):
+    monkeypatch.setattr(Config, "REMOTE_ONLY", False)
+
+
+def test_local_entry_without_path_is_rejected(tmp_path):
+    manifest = write_manifest(tmp_path, [{"owner": "octo", "repo": "one"}])
+    with pytest.raises(ValueError, match="path"):
+        load_manifest(manifest)
+
+
+def test_remote_only_entry_needs_no_path(tmp_path):
+    manifest = write_manifest(tmp_path, [{"owner": "octo", "repo": "one", "remote_only": True}])
+    specs, _ = load_manifest(manifest)
+    assert specs[0].path is None
+
+
+def test_entries_sharing_a_clone_are_rejected(tmp_path):
+    manifest = write_manifest(tmp_path, [
+        {"owner": "octo", "repo": "one", "path": "clones/shared"},
+        {"owner": "octo", "repo": "two", "path": "clones/../clones/shared"},
+    ])
+    with pytest.raises(ValueError, match="share the clone"):
+        load_manifest(manifest)
+
+
+def test_distinct_clones_load(tmp_path):
+    manifest = write_manifest(tmp_path, [
+        {"owner": "octo", "repo": "one", "path": "clones/one"},
+        {"owner": "octo", "repo": "two", "path": "clones/two"},
+    ])
+    specs, _ = load_manifest(manifest)
+    assert [spec.path for spec in specs] == [str(tmp_path / "clones/one"), str(tmp_path / "clones/two")]
+
+
+def test_http_cache_reports_the_shared_client_hit_rate(monkeypatch):
+    import github_client
+
+    monkeypatch.setattr(Config, "HTTP_CACHE_PATH", ":memory:")
+    client = github_client._create_client("token", "https://api.github.test", 1)
+    cache = client._Github__requester._Requester__connection.cache
+    cache.hits, cache.misses = 3, 1
+    runner = FleetRunner([], concurrency=1, github=client, housekeeping=False)
+    try:
+        assert runner.http_cache() == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+    finally:
+        runner.shutdown()
+
+
+def test_http_cache_is_none_before_the_client_exists():
+    runner = FleetRunner([], concurrency=1, housekeeping=False)
+    try:
+        assert runner.http_cache() is None
+    finally:
+        runner.shutdown()
@@ -0,0 +1,17 @@
+import pytest
+
+from generators import create_generator
+
+
+def test_json_generator_rejects_a_content_template(tmp_path):
+    template = tmp_path / "entry.md"
+    template.write_text("{timestamp}\n")
+    with pytest.raises(ValueError, match="CONTENT_TEMPLATE"):
+        create_generator("json", "monthly", "contributions", str(template))
+
+
+def test_templated_generators_accept_a_content_template(tmp_path):
+    template = tmp_path / "entry.md"
+    template.write_text("- {date}: {message}\n")
+    for name in ("markdown", "changelog"):
+        assert create_generator(name, "monthly", "contributions", str(template)).template.text == template.read_text()
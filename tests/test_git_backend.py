@@ -0,0 +1,73 @@
+import subprocess
+
+import pytest
+
+from git_backend import FastImportGitBackend, UnsupportedRepository
+
+
+@pytest.fixture
+def clone(tmp_path):
+    subprocess.run(["git", "init", "-q", "-b", "main", str(tmp_path)], check=True)
+    for key, value in (("user.name", "Test"), ("user.email", "test@example.com")):
+        subprocess.run(["git", "config", key, value], cwd=tmp_path, check=True)
+    return str(tmp_path)
+
+
+def test_fastimport_start_failure_surfaces_the_real_error(clone, monkeypatch):
+    backend = FastImportGitBackend(clone)
+
+    def fail(*args, **kwargs):
+        raise OSError("cannot fork")
+
+    monkeypatch.setattr(subprocess, "Popen", fail)
+    with pytest.raises(UnsupportedRepository, match="cannot fork"):
+        backend.commit_file("a.md", "a\n", "add a", "main")
+    assert backend.restarts == 1
+
+
+def test_remote_commit_of_nothing_makes_no_requests():
+    from git_backend import RemoteGitBackend
+
+    def no_repo():
+        raise AssertionError("the repository should not be looked up")
+
+    assert RemoteGitBackend(no_repo, ledger=None).commit_files([], "main") == []
+
+
+def test_object_backend_closes_packs_replaced_by_a_repack(clone):
+    from git_backend import ObjectGitBackend
+
+    backend = ObjectGitBackend(clone)
+    for i in range(2):
+        backend.commit_file(f"c/{i}.md", f"{i}\n", f"add {i}", "main")
+        subprocess.run(["git", "repack", "-q"], cwd=clone, check=True)
+    old_readers = backend._pack_readers()
+    assert len(old_readers) == 2
+
+    subprocess.run(["git", "repack", "-a", "-d", "-q"], cwd=clone, check=True)
+    assert len(backend._pack_readers()) == 1
+    assert all(reader.pack.closed and reader._pack_file.closed for reader in old_readers)
+
+
+def test_fastimport_reports_commits_only_once_a_checkpoint_made_them_durable(clone):
+    backend = FastImportGitBackend(clone, checkpoint_every=3)
+    recorded = []
+    items = [(f"c/{i}.md", f"{i}\n", f"add {i}", None) for i in range(4)]
+    for path, content, message, when in items:
+        backend.commit_file(path, content, message, "main", when, recorded.append)
+    # Killed before the fourth commit was checkpointed: only the first three may be reported
+    backend._kill()
+    assert len(recorded) == 3
+    for sha in recorded:
+        subprocess.run(["git", "cat-file", "-e", sha], cwd=clone, check=True)
+
+
+def test_fastimport_batch_reports_every_commit_before_returning(clone):
+    backend = FastImportGitBackend(clone, checkpoint_every=100)
+    recorded = []
+    items = [(f"c/{i}.md", f"{i}\n", f"add {i}", None) for i in range(5)]
+    shas = backend.commit_files(items, "main", lambda index, sha: recorded.append((index, sha)))
+    assert recorded == list(enumerate(shas))
+    assert subprocess.run(["git", "rev-parse", "main"], cwd=clone, capture_output=True,
+                          text=True).stdout.strip() == shas[-1]
+    backend.close()
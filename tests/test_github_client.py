@@ -0,0 +1,32 @@
+import time
+
+from github_client import ConditionalCache, _is_later_page
+
+
+def keys(cache):
+    return {row[0] for row in cache._conn.execute("SELECT key FROM responses")}
+
+
+def test_put_drops_entries_unused_for_longer_than_max_age():
+    cache = ConditionalCache(":memory:", max_age=60, max_entries=100)
+    cache.put("old", '"a"', None, {}, "old body")
+    cache._conn.execute("UPDATE responses SET stored_at = ?", (time.time() - 120,))
+    cache.put("new", '"b"', None, {}, "new body")
+    assert keys(cache) == {"new"}
+
+
+def test_put_keeps_the_most_recently_used_entries_within_the_cap():
+    cache = ConditionalCache(":memory:", max_age=3600, max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, f'"{key}"', None, {}, key)
+        time.sleep(0.01)
+    cache.touch("a")
+    time.sleep(0.01)
+    cache.put("c", '"c"', None, {}, "c")
+    assert keys(cache) == {"a", "c"}
+
+
+def test_only_the_first_page_of_a_listing_is_cached():
+    assert not _is_later_page("/repos/o/r/commits?sha=main")
+    assert not _is_later_page("/repos/o/r/commits?sha=main&page=1")
+    assert _is_later_page("/repos/o/r/commits?sha=main&page=2")
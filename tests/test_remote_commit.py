@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from benchmarks.fake_github import FakeGitHub
+from config import Config
+
+
+@pytest.fixture
+def fake():
+    with FakeGitHub() as fake:
+        yield fake
+
+
+@pytest.fixture
+def bot(fake, tmp_path, monkeypatch):
+    for key, value in (("GITHUB_TOKEN", Config.GITHUB_TOKEN or "test-token"), ("GITHUB_API_URL", fake.url),
+                       ("REPO_OWNER", fake.owner), ("GITHUB_REPO", fake.repo), ("GITHUB_BRANCH", fake.branch),
+                       ("LEDGER_PATH", ":memory:"), ("HTTP_CACHE_PATH", ":memory:"), ("REMOTE_ONLY", True)):
+        monkeypatch.setattr(Config, key, value)
+
+    from commit_bot import GitHubCommitBot
+    # An empty directory: remote-only mode must never need a clone
+    bot = GitHubCommitBot(repo_dir=str(tmp_path))
+    bot.repo
+    return bot
+
+
+def commit_once(fake, bot):
+    fake.reset_counts()
+    assert bot.create_commit()
+    return fake.request_count
+
+
+def assert_linear(fake):
+    for child, parent in zip(fake.commits, fake.commits[1:]):
+        assert child["parents"] == [parent["sha"]]
+
+
+def test_warm_commits_cost_a_constant_number_of_requests(fake, bot):
+    commit_once(fake, bot)  # empty repository
+    commit_once(fake, bot)  # cold cache
+    assert [commit_once(fake, bot) for _ in range(5)] == [3] * 5
+    assert_linear(fake)
+
+
+def test_batch_chains_each_commit_onto_the_previous_one(fake, bot):
+    commit_once(fake, bot)
+    assert bot.create_commits(5)
+    assert len(fake.commits) == 6
+    assert_linear(fake)
+
+
+def test_batch_of_nothing_makes_no_requests(fake, bot):
+    fake.reset_counts()
+    assert bot.git.commit_files([], fake.branch) == []
+    assert fake.request_count == 0
+
+
+def test_check_today_commits_needs_no_clone(fake, bot, tmp_path):
+    fake.add_history(1)
+    assert bot.check_today_commits()
+    assert os.listdir(tmp_path) == []
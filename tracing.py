@@ -0,0 +1,167 @@
+"""
+Per-phase timing for GitHub Commit Bot
+Records how long each step of the commit pipeline takes (connect, check,
+render, stage, commit, push) as JSON lines and Prometheus histograms.
+When tracing is disabled every hook is a shared no-op.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from config import Config
+
+PHASES = ("connect", "check", "render", "stage", "commit", "push")
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRIC = "gitgremlin_phase_seconds"
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "labels", "start")
+
+    def __init__(self, tracer, name, labels):
+        self.tracer = tracer
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.tracer.observe(self.name, seconds, self.labels, exc_type.__name__ if exc_type else None)
+        return False
+
+
+class Tracer:
+    """Collects phase durations; writes JSON lines as they happen and histograms on flush()"""
+
+    def __init__(self, enabled=False, jsonl_path=None, metrics_path=None, buckets=BUCKETS):
+        self.enabled = enabled
+        self.jsonl_path = jsonl_path
+        self.metrics_path = metrics_path
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._jsonl = None
+        self._histograms = {}  # phase -> [bucket counts..., sum, count]
+
+    def phase(self, name, **labels):
+        """Context manager timing one phase"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, labels)
+
+    @contextmanager
+    def context(self, **labels):
+        """Attach `labels` (e.g. repo=...) to every phase recorded by this thread inside the block"""
+        if not self.enabled:
+            yield
+            return
+        previous = getattr(self._local, "labels", {})
+        self._local.labels = dict(previous, **labels)
+        try:
+            yield
+        finally:
+            self._local.labels = previous
+
+    def observe(self, name, seconds, labels=None, error=None):
+        record = {"ts": round(time.time(), 3), "phase": name, "seconds": round(seconds, 6)}
+        record.update(getattr(self._local, "labels", {}))
+        if labels:
+            record.update(labels)
+        if error:
+            record["error"] = error
+
+        with self._lock:
+            histogram = self._histograms.setdefault(name, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            if self.jsonl_path:
+                if self._jsonl is None:
+                    self._jsonl = open(self.jsonl_path, "a")
+                self._jsonl.write(json.dumps(record) + "\n")
+                self._jsonl.flush()
+
+    def prometheus_text(self):
+        """Render the histograms in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {METRIC} Wall-clock time spent in each commit pipeline phase",
+            f"# TYPE {METRIC} histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._histograms):
+                histogram = self._histograms[name]
+                for bound, count in zip(self.buckets, histogram):
+                    lines.append(f'{METRIC}_bucket{{phase="{name}",le="{bound}"}} {count}')
+                lines.append(f'{METRIC}_bucket{{phase="{name}",le="+Inf"}} {histogram[-1]}')
+                lines.append(f'{METRIC}_sum{{phase="{name}"}} {histogram[-2]:.6f}')
+                lines.append(f'{METRIC}_count{{phase="{name}"}} {histogram[-1]}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Return {phase: (count, total seconds)}"""
+        with self._lock:
+            return {name: (h[-1], h[-2]) for name, h in self._histograms.items()}
+
+    def flush(self):
+        """Rewrite the Prometheus metrics file (e.g. for node_exporter's textfile collector)"""
+        if not self.enabled or not self.metrics_path:
+            return
+        tmp_path = f"{self.metrics_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, self.metrics_path)
+
+
+def _resolve(path):
+    if not path:
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+tracer = Tracer(Config.TRACE_ENABLED, _resolve(Config.TRACE_PATH), _resolve(Config.TRACE_METRICS_PATH))
+
+
+def enable(jsonl_path=None, metrics_path=None):
+    """Turn tracing on at runtime (e.g. from --trace)"""
+    tracer.enabled = True
+    if jsonl_path is not None:
+        tracer.jsonl_path = jsonl_path
+    if metrics_path is not None:
+        tracer.metrics_path = metrics_path
+
+
+def phase(name, **labels):
+    return tracer.phase(name, **labels)
+
+
+def traced(name):
+    """Decorator timing every call of the wrapped function as phase `name`"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator